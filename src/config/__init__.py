@@ -1,10 +1,11 @@
 # Config Package
 from .settings import settings, Settings
-from .llm import get_llm_client, LLMClient, LLMResponse
+from .llm import get_llm_client, json_schema_format, LLMClient, LLMResponse
 from .prompts import (
     AgentPrompts,
     load_prompt,
     compose_agent_prompt,
+    invalidate_prompt_cache,
     get_privacy_rules,
     PRIVACY_THRESHOLD,
 )
@@ -13,11 +14,13 @@ __all__ = [
     "settings",
     "Settings",
     "get_llm_client",
+    "json_schema_format",
     "LLMClient",
     "LLMResponse",
     "AgentPrompts",
     "load_prompt",
     "compose_agent_prompt",
+    "invalidate_prompt_cache",
     "get_privacy_rules",
     "PRIVACY_THRESHOLD",
 ]
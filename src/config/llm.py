@@ -13,16 +13,70 @@ Features:
 """
 
 import json
-from typing import Optional, List, Dict, Any, Union
-from dataclasses import dataclass
+import asyncio
+import sqlite3
+from typing import Optional, List, Dict, Any, Union, Tuple, Awaitable, Iterable, TypeVar, AsyncIterator
+from dataclasses import dataclass, field
 from functools import lru_cache
 
+import orjson
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
 from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
 
 from src.config.settings import settings
+from src.config import llm_cache
+
+
+def _parse_json(content: str) -> Any:
+    """
+    Parse JSON text with orjson, falling back to the stdlib parser.
+    
+    orjson rejects strings that are not valid UTF-8 (e.g. lone surrogates),
+    which the stdlib json module still accepts.
+    """
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return json.loads(content)
+
+
+def _extract_usage(response: Any) -> Dict[str, int]:
+    """
+    Extract token usage from a LangChain response.
+    
+    cached_tokens counts prompt tokens served from the provider's prefix cache.
+    """
+    if not hasattr(response, 'response_metadata'):
+        return {}
+    token_usage = response.response_metadata.get('token_usage') or {}
+    prompt_details = token_usage.get('prompt_tokens_details') or {}
+    return {
+        "prompt_tokens": token_usage.get('prompt_tokens', 0),
+        "completion_tokens": token_usage.get('completion_tokens', 0),
+        "total_tokens": token_usage.get('total_tokens', 0),
+        "cached_tokens": prompt_details.get('cached_tokens') or 0,
+    }
+
+
+def json_schema_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a strict Structured Outputs response_format for a JSON schema.
+    
+    The provider constrains generation to the schema, so responses always
+    parse. Build the format once per schema (module constant) so every call
+    sends identical bytes and reuses the provider's compiled grammar.
+    
+    Args:
+        name: Schema name (letters, digits, underscores)
+        schema: JSON schema; strict mode requires every property to be
+            listed in "required" and additionalProperties to be false
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "strict": True, "schema": schema}
+    }
 
 
 @dataclass
@@ -31,6 +85,8 @@ class LLMResponse:
     content: str
     model: str
     usage: Dict[str, int]
+    from_cache: bool = False  # Served from the persistent LLM cache (no tokens used)
+    cache_key: Optional[str] = field(default=None, repr=False)  # Pending entry for cache_response()
     
     def to_json(self) -> Optional[Dict]:
         """Try to parse content as JSON."""
@@ -46,7 +102,7 @@ class LLMResponse:
                 end = content.find("```", start)
                 content = content[start:end].strip()
             
-            return json.loads(content)
+            return _parse_json(content)
         except (json.JSONDecodeError, ValueError):
             return None
 
@@ -99,25 +155,16 @@ class LangChainLLM:
         """Get the underlying ChatOpenAI model."""
         return self._chat_model
     
-    def chat(
+    def _prepare_chat(
         self,
         messages: List[Dict[str, str]],
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
-        json_mode: bool = False
-    ) -> LLMResponse:
-        """
-        Send a chat completion request using LangChain.
-        
-        Args:
-            messages: List of message dicts with 'role' and 'content'
-            temperature: Override default temperature
-            max_tokens: Override default max_tokens
-            json_mode: Request JSON response format
-            
-        Returns:
-            LLMResponse with content and metadata
-        """
+        json_mode: bool = False,
+        prompt_cache_key: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Any, List[Any]]:
+        """Build the configured model and LangChain messages for a chat call."""
         # Convert to LangChain message format
         lc_messages = []
         for msg in messages:
@@ -141,22 +188,79 @@ class LangChainLLM:
                 openai_api_key=settings.openai_api_key
             )
         
-        # Add JSON mode if requested
-        if json_mode:
+        # Structured output: an explicit schema wins over plain JSON mode
+        if response_format:
+            model = model.bind(response_format=response_format)
+        elif json_mode:
             model = model.bind(response_format={"type": "json_object"})
         
-        # Invoke model
-        response = model.invoke(lc_messages)
+        # OpenAI caches prompt prefixes automatically; the key improves hit rate
+        if prompt_cache_key:
+            model = model.bind(extra_body={"prompt_cache_key": prompt_cache_key})
         
+        return model, lc_messages
+    
+    def _cache_key(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        json_mode: bool,
+        response_format: Optional[Dict[str, Any]]
+    ) -> Optional[str]:
+        """Persistent-cache key for a call, or None if it should not be cached."""
+        temperature = self.temperature if temperature is None else temperature
+        if not settings.llm_cache_enabled or temperature != 0:
+            return None
+        return llm_cache.make_key(
+            self.model_name,
+            messages,
+            temperature=temperature,
+            max_tokens=max_tokens or self.max_tokens,
+            json_mode=json_mode,
+            response_format=response_format
+        )
+    
+    def _cache_get(self, key: Optional[str]) -> Optional[LLMResponse]:
+        """Return a cached response, or None on a miss (or cache error)."""
+        if key is None:
+            return None
+        try:
+            hit = llm_cache.get(llm_cache.get_connection(), key, ttl=settings.llm_cache_ttl_seconds)
+        except (sqlite3.Error, OSError):
+            return None
+        if hit is None:
+            return None
+        
+        self._last_usage = {}
+        return LLMResponse(content=hit[0], model=self.model_name, usage={}, from_cache=True)
+    
+    def _cache_put(self, key: Optional[str], response: LLMResponse, cache: bool = True) -> LLMResponse:
+        """
+        Store a fresh response (cache errors are ignored).
+        
+        With cache=False the key is kept on the response instead, so the
+        caller can store it with cache_response() once the output is known good.
+        """
+        if not cache:
+            response.cache_key = key
+        elif key is not None and response.content:
+            try:
+                llm_cache.put(llm_cache.get_connection(), key, response.content, response.usage)
+            except (sqlite3.Error, OSError):
+                pass
+        return response
+    
+    def cache_response(self, response: LLMResponse) -> None:
+        """Store a response fetched with cache=False, after the caller validated it."""
+        if response.cache_key is not None and not response.from_cache:
+            self._cache_put(response.cache_key, response)
+            response.cache_key = None
+    
+    def _to_response(self, response: Any) -> LLMResponse:
+        """Wrap a LangChain message as an LLMResponse and record usage."""
         # Extract token usage from response metadata
-        usage = {}
-        if hasattr(response, 'response_metadata'):
-            token_usage = response.response_metadata.get('token_usage', {})
-            usage = {
-                "prompt_tokens": token_usage.get('prompt_tokens', 0),
-                "completion_tokens": token_usage.get('completion_tokens', 0),
-                "total_tokens": token_usage.get('total_tokens', 0),
-            }
+        usage = _extract_usage(response)
         self._last_usage = usage
         
         return LLMResponse(
@@ -165,21 +269,95 @@ class LangChainLLM:
             usage=usage
         )
     
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        json_mode: bool = False,
+        prompt_cache_key: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        cache: bool = True
+    ) -> LLMResponse:
+        """
+        Send a chat completion request using LangChain.
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Override default temperature
+            max_tokens: Override default max_tokens
+            json_mode: Request JSON response format
+            prompt_cache_key: Routing hint so requests sharing a static
+                prefix (e.g. an agent's system prompt) land on the same
+                provider prompt cache
+            response_format: Explicit response format, e.g. from
+                json_schema_format(); overrides json_mode
+            cache: Store the response in the persistent cache right away.
+                Pass False for output that still has to be validated, then
+                call cache_response() once it is known good
+            
+        Returns:
+            LLMResponse with content and metadata. Temperature-0 calls are
+            served from the persistent LLM cache when possible
+            (from_cache=True, empty usage).
+        """
+        key = self._cache_key(messages, temperature, max_tokens, json_mode, response_format)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        model, lc_messages = self._prepare_chat(
+            messages, temperature, max_tokens, json_mode, prompt_cache_key, response_format
+        )
+        return self._cache_put(key, self._to_response(model.invoke(lc_messages)), cache)
+    
+    async def achat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        json_mode: bool = False,
+        prompt_cache_key: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        cache: bool = True
+    ) -> LLMResponse:
+        """Async version of chat(); the event loop is free while waiting on the API."""
+        key = self._cache_key(messages, temperature, max_tokens, json_mode, response_format)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        model, lc_messages = self._prepare_chat(
+            messages, temperature, max_tokens, json_mode, prompt_cache_key, response_format
+        )
+        return self._cache_put(key, self._to_response(await model.ainvoke(lc_messages)), cache)
+    
     def complete(
         self,
         system_prompt: str,
         user_prompt: str,
         temperature: Optional[float] = None,
-        json_mode: bool = False
+        json_mode: bool = False,
+        prompt_cache_key: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        max_tokens: Optional[int] = None,
+        cache: bool = True
     ) -> LLMResponse:
         """
         Simple completion with system and user prompts.
         
+        The system prompt is sent first so a static system prompt forms a
+        stable prefix for provider-side prompt caching.
+        
         Args:
             system_prompt: System instructions
             user_prompt: User message
             temperature: Override default temperature
             json_mode: Request JSON response format
+            prompt_cache_key: Provider prompt-cache routing hint (see chat())
+            response_format: Structured-output format (see chat())
+            max_tokens: Override default max_tokens
+            cache: Store the response in the persistent cache (see chat())
             
         Returns:
             LLMResponse
@@ -189,7 +367,68 @@ class LangChainLLM:
             {"role": "user", "content": user_prompt}
         ]
         
-        return self.chat(messages, temperature=temperature, json_mode=json_mode)
+        return self.chat(
+            messages,
+            temperature=temperature,
+            json_mode=json_mode,
+            max_tokens=max_tokens,
+            prompt_cache_key=prompt_cache_key,
+            response_format=response_format,
+            cache=cache
+        )
+    
+    async def acomplete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: Optional[float] = None,
+        json_mode: bool = False,
+        prompt_cache_key: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        max_tokens: Optional[int] = None,
+        cache: bool = True
+    ) -> LLMResponse:
+        """Async version of complete()."""
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        
+        return await self.achat(
+            messages,
+            temperature=temperature,
+            json_mode=json_mode,
+            max_tokens=max_tokens,
+            prompt_cache_key=prompt_cache_key,
+            response_format=response_format,
+            cache=cache
+        )
+    
+    async def astream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: Optional[float] = None,
+        json_mode: bool = False,
+        prompt_cache_key: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion, yielding content text as it arrives.
+        
+        Token usage is not reported for streamed calls.
+        """
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        model, lc_messages = self._prepare_chat(
+            messages, temperature, None, json_mode, prompt_cache_key, response_format
+        )
+        
+        async for chunk in model.astream(lc_messages):
+            if chunk.content:
+                yield chunk.content
     
     def complete_with_context(
         self,
@@ -304,14 +543,7 @@ class LangChainLLM:
             )
         
         # Extract usage
-        usage = {}
-        if hasattr(response, 'response_metadata'):
-            token_usage = response.response_metadata.get('token_usage', {})
-            usage = {
-                "prompt_tokens": token_usage.get('prompt_tokens', 0),
-                "completion_tokens": token_usage.get('completion_tokens', 0),
-                "total_tokens": token_usage.get('total_tokens', 0),
-            }
+        usage = _extract_usage(response)
         
         return LLMResponse(
             content=response.content,
@@ -340,6 +572,30 @@ def get_llm_client() -> LangChainLLM:
     return LangChainLLM()
 
 
+# Cap on concurrent in-flight LLM requests (provider rate limits)
+MAX_CONCURRENT_LLM_CALLS = 8
+
+T = TypeVar("T")
+
+
+async def gather_limited(
+    awaitables: Iterable[Awaitable[T]],
+    limit: int = MAX_CONCURRENT_LLM_CALLS
+) -> List[T]:
+    """
+    Await several coroutines concurrently, at most `limit` at a time.
+    
+    Results are returned in input order, like asyncio.gather.
+    """
+    semaphore = asyncio.Semaphore(limit)
+    
+    async def _limited(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+    
+    return await asyncio.gather(*(_limited(aw) for aw in awaitables))
+
+
 # Convenience function for RAG-augmented completion
 def complete_with_rag(
     question: str,
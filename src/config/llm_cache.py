@@ -0,0 +1,132 @@
+"""
+LLM Cache: Persistent SQLite cache for LLM responses.
+
+Responses survive process restarts, so an analyst re-asking yesterday's
+question gets the stored answer from a local lookup instead of an API call.
+
+Keys hash the model, every request parameter, and the full message list,
+so a hit only happens for byte-identical requests. Only deterministic
+calls (temperature 0) are cached by the client, and entries older than
+the TTL count as misses.
+
+Usage:
+    conn = get_connection()
+    key = make_key(model, messages, response_format=...)
+    hit = get(conn, key)
+    if hit is None:
+        ...call the LLM...
+        put(conn, key, content, usage)
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from src.config.settings import settings
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    usage BLOB NOT NULL,
+    created REAL NOT NULL
+)
+"""
+
+# One connection per thread (sqlite3 connections are not shareable by default)
+_local = threading.local()
+
+
+def _cache_path() -> Path:
+    """Absolute path of the cache database."""
+    return settings.get_absolute_path(settings.llm_cache_path)
+
+
+def get_connection(path: Optional[Path] = None) -> sqlite3.Connection:
+    """
+    Get this thread's connection to the cache database, creating it if needed.
+
+    WAL mode lets readers proceed while another process writes.
+
+    Args:
+        path: Database file (defaults to settings.llm_cache_path)
+    """
+    path = Path(path or _cache_path())
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    conn = connections.get(path)
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        connections[path] = conn
+
+    return conn
+
+
+def make_key(model: str, messages: List[Dict[str, str]], **params: Any) -> str:
+    """
+    Hash a request into a cache key.
+
+    Args:
+        model: Model name
+        messages: Chat messages (role + content)
+        **params: Every other parameter that affects the output
+            (temperature, max_tokens, response_format, ...)
+    """
+    payload = orjson.dumps(
+        {"model": model, "messages": messages, "params": params},
+        option=orjson.OPT_SORT_KEYS,
+        default=str
+    )
+    return hashlib.blake2b(payload, digest_size=20).hexdigest()
+
+
+def get(
+    conn: sqlite3.Connection,
+    key: str,
+    ttl: Optional[float] = None
+) -> Optional[Tuple[str, Dict[str, int]]]:
+    """
+    Look up a cached response.
+
+    Args:
+        conn: Cache connection
+        key: Key from make_key()
+        ttl: Maximum entry age in seconds (None or 0 = no expiry)
+
+    Returns:
+        Tuple of (content, original token usage), or None on a miss
+    """
+    row = conn.execute("SELECT value, usage, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+    if row is None:
+        return None
+    if ttl and row[2] < time.time() - ttl:
+        return None
+    return row[0].decode(), orjson.loads(row[1])
+
+
+def put(conn: sqlite3.Connection, key: str, value: str, usage: Dict[str, int]) -> None:
+    """Store a response and the token usage it originally cost."""
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, value, usage, created) VALUES (?, ?, ?, ?)",
+            (key, value.encode(), orjson.dumps(usage), time.time())
+        )
+
+
+def clear(conn: Optional[sqlite3.Connection] = None) -> None:
+    """Delete every cached response."""
+    conn = conn or get_connection()
+    with conn:
+        conn.execute("DELETE FROM llm_cache")
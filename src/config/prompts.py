@@ -178,6 +178,25 @@ class AgentPrompts:
             include_schema=False,
             include_guardrails=False
         )
+    
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def fused() -> str:
+        """Full prompt for the fused SQL + explanation call."""
+        return "\n\n---\n\n".join([AgentPrompts.sql(), get_agent_prompt("explanation")])
+
+
+def invalidate_prompt_cache() -> None:
+    """
+    Clear loaded and composed prompts.
+    
+    Prompts are read once per process so every request sends an identical
+    system prompt prefix. Call this after editing files in prompts/
+    (e.g. a schema hot-reload) to pick up the changes.
+    """
+    load_prompt.cache_clear()
+    for name in ("definition", "sql", "quality", "explanation", "fused"):
+        getattr(AgentPrompts, name).cache_clear()
 
 
 # Privacy constants
@@ -33,6 +33,14 @@ class Settings:
     schema_path: str = "data/schema.json"
     knowledge_path: str = "data/knowledge.json"
     
+    # Caching
+    semantic_cache_enabled: bool = True
+    semantic_cache_threshold: float = 0.95  # Min cosine similarity for a hit
+    fused_mode: bool = False
+    llm_cache_enabled: bool = True  # Persistent cache for temperature-0 calls
+    llm_cache_path: str = ".cache/llm_cache.sqlite"
+    llm_cache_ttl_seconds: float = 7 * 24 * 3600  # Entries older than this are misses (0 = never expire)
+    
     # Logging
     log_level: str = "INFO"
     
@@ -53,6 +61,12 @@ class Settings:
             data_path=os.getenv("DATA_PATH", "data/sample_events.csv"),
             schema_path=os.getenv("SCHEMA_PATH", "data/schema.json"),
             knowledge_path=os.getenv("KNOWLEDGE_PATH", "data/knowledge.json"),
+            semantic_cache_enabled=os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true",
+            semantic_cache_threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")),
+            fused_mode=os.getenv("FUSED_MODE", "false").lower() in ("1", "true"),
+            llm_cache_enabled=os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true",
+            llm_cache_path=os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite"),
+            llm_cache_ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
             log_level=os.getenv("LOG_LEVEL", "INFO"),
             project_root=PROJECT_ROOT,
         )
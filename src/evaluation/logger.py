@@ -10,6 +10,7 @@ Features:
 
 import json
 import logging
+import threading
 import uuid
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
@@ -117,6 +118,10 @@ class QuerySession:
         return json.dumps(self.to_dict(), indent=2, default=str)
 
 
+# Active session per thread, so concurrent queries don't mix traces
+_session_local = threading.local()
+
+
 class SessionLogger:
     """
     Manages logging for a query session.
@@ -129,7 +134,10 @@ class SessionLogger:
         session.finish(state)
     """
     
-    _current_session: Optional[QuerySession] = None
+    @property
+    def _current_session(self) -> Optional[QuerySession]:
+        """Session started on this thread."""
+        return getattr(_session_local, "session", None)
     
     @classmethod
     def start(cls, question: str) -> "SessionLogger":
@@ -139,7 +147,7 @@ class SessionLogger:
             question=question,
             timestamp=datetime.now().isoformat()
         )
-        cls._current_session = session
+        _session_local.session = session
         
         logger.info(json.dumps({
             "event": "session_start",
@@ -151,8 +159,8 @@ class SessionLogger:
     
     @classmethod
     def get_current(cls) -> Optional[QuerySession]:
-        """Get the current session."""
-        return cls._current_session
+        """Get the current session (for this thread)."""
+        return getattr(_session_local, "session", None)
     
     def log_agent_start(self, agent_name: str, input_data: Optional[Dict] = None):
         """Log agent execution start."""
@@ -9,7 +9,7 @@ from typing import Tuple, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 
-from src.tools.schema_tool import get_column_names
+from src.tools.schema_tool import get_column_set
 
 
 class SQLValidationStatus(Enum):
@@ -143,7 +143,7 @@ def _check_columns(sql: str) -> List[str]:
     warnings = []
     
     try:
-        valid_columns = set(get_column_names())
+        valid_columns = get_column_set()
         
         # Extract potential column references (simple heuristic)
         # Look for words that could be column names
@@ -2,6 +2,7 @@
 from .state import OrchestratorState, create_initial_state
 from .router import route_to_specialists, classify_intent
 from .graph import create_graph, get_graph, run_query
+from .batch import run_many
 
 __all__ = [
     "OrchestratorState",
@@ -11,4 +12,5 @@ __all__ = [
     "create_graph",
     "get_graph",
     "run_query",
+    "run_many",
 ]
@@ -0,0 +1,42 @@
+"""
+Batch: Run several independent questions concurrently.
+
+Each question goes through the full orchestrator graph. The pipelines are
+I/O-bound (LLM calls, DuckDB queries), so running them on a thread pool
+brings N questions close to the latency of the slowest one instead of
+the sum of all of them.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from src.config.llm import MAX_CONCURRENT_LLM_CALLS
+from .graph import get_graph, run_query
+
+
+def run_many(
+    questions: List[str],
+    max_workers: int = MAX_CONCURRENT_LLM_CALLS,
+    enable_logging: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Run several questions through the orchestrator concurrently.
+    
+    Args:
+        questions: User analytics questions
+        max_workers: Maximum pipelines in flight (keeps bursts within
+            provider rate limits)
+        enable_logging: Whether to log each session (default True)
+        
+    Returns:
+        Final states from run_query(), in the same order as questions
+    """
+    if not questions:
+        return []
+    
+    # Compile the graph once up front rather than racing on first use
+    get_graph()
+    
+    workers = min(max_workers, len(questions))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="orchestrator") as executor:
+        return list(executor.map(lambda q: run_query(q, enable_logging=enable_logging), questions))
@@ -17,6 +17,8 @@ from src.specialists.definition_agent import agent as definition_agent
 from src.specialists.sql_agent import agent as sql_agent
 from src.specialists.data_quality_agent import agent as data_quality_agent
 from src.specialists.explanation_agent import agent as explanation_agent
+from src.specialists import fused_agent
+from src.config.settings import settings
 from src.evaluation.logger import SessionLogger
 from src.evaluation.self_eval import evaluate_response
 from src.evaluation.query_store import get_query_store
@@ -79,14 +81,22 @@ def definition_node(state: OrchestratorState) -> Dict[str, Any]:
 
 
 def sql_node(state: OrchestratorState) -> Dict[str, Any]:
-    """Run SQL Agent."""
+    """Run SQL Agent (or the fused SQL + explanation agent when FUSED_MODE is on)."""
     state = add_trace(state, "sql_agent", "started")
     
-    result = sql_agent.run(state)
+    if settings.fused_mode:
+        result = fused_agent.run(state)
+    else:
+        result = sql_agent.run(state)
     
     # Track tokens
     tokens = result.get("_sql_tokens", {})
-    total_tokens = state.get("total_tokens", 0) + tokens.get("total_tokens", 0)
+    explanation_tokens = (result.get("explanation") or {}).get("_tokens", {})
+    total_tokens = (
+        state.get("total_tokens", 0)
+        + tokens.get("total_tokens", 0)
+        + explanation_tokens.get("total_tokens", 0)
+    )
     
     sql_result = result.get("sql_result") or {}
     state = add_trace(state, "sql_agent", "completed", {
@@ -180,6 +190,10 @@ def route_after_sql(state: OrchestratorState) -> Literal["data_quality", "format
     if errors or not sql_result:
         return "format_response"
     
+    # Fused mode already produced the quality check and explanation
+    if state.get("explanation"):
+        return "format_response"
+    
     return "data_quality"
 
 
@@ -4,7 +4,7 @@ Embedder: Convert text to vector embeddings using OpenAI.
 Uses text-embedding-3-small for cost-effective, high-quality embeddings.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from functools import lru_cache
 
 from langchain_openai import OpenAIEmbeddings
@@ -31,18 +31,26 @@ def get_embedder() -> OpenAIEmbeddings:
     )
 
 
+@lru_cache(maxsize=512)
+def _embed_query_cached(text: str) -> Tuple[float, ...]:
+    """Embed a query once per process (immutable so the cache is safe to share)."""
+    return tuple(get_embedder().embed_query(text))
+
+
 def embed_text(text: str) -> List[float]:
     """
     Embed a single text string.
     
+    Repeated texts (e.g. the same question embedded for retrieval and for
+    the semantic cache) reuse the first embedding.
+    
     Args:
         text: Text to embed
         
     Returns:
         List of floats representing the embedding vector
     """
-    embedder = get_embedder()
-    return embedder.embed_query(text)
+    return list(_embed_query_cached(text))
 
 
 def embed_texts(texts: List[str]) -> List[List[float]]:
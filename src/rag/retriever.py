@@ -5,6 +5,7 @@ Provides RAG retrieval for augmenting LLM prompts with relevant
 knowledge and schema information.
 """
 
+import threading
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
@@ -15,6 +16,7 @@ from .vector_store import (
     SCHEMA_COLLECTION
 )
 from .indexer import is_indexed, index_knowledge_base
+from .embedder import embed_text
 
 
 @dataclass
@@ -134,13 +136,17 @@ class RAGRetriever:
         """
         result = RetrievalResult(query=query)
         
+        # Embed once for both collections
+        query_embedding = embed_text(query) if k_knowledge > 0 or k_schema > 0 else None
+        
         # Search knowledge collection
         if k_knowledge > 0:
             result.knowledge_results = self.store.search(
                 query=query,
                 collection=KNOWLEDGE_COLLECTION,
                 k=k_knowledge,
-                filter_metadata=filter_knowledge
+                filter_metadata=filter_knowledge,
+                query_embedding=query_embedding
             )
         
         # Search schema collection
@@ -149,7 +155,8 @@ class RAGRetriever:
                 query=query,
                 collection=SCHEMA_COLLECTION,
                 k=k_schema,
-                filter_metadata=filter_schema
+                filter_metadata=filter_schema,
+                query_embedding=query_embedding
             )
         
         return result
@@ -209,13 +216,21 @@ class RAGRetriever:
 
 # Global retriever instance
 _retriever: Optional[RAGRetriever] = None
+_retriever_lock = threading.Lock()
 
 
 def get_retriever() -> RAGRetriever:
-    """Get or create the global retriever."""
+    """
+    Get or create the global retriever.
+    
+    Initialization (vector store open + auto-index) runs once per process,
+    even when several threads ask for the retriever concurrently.
+    """
     global _retriever
     if _retriever is None:
-        _retriever = RAGRetriever(auto_index=True)
+        with _retriever_lock:
+            if _retriever is None:
+                _retriever = RAGRetriever(auto_index=True)
     return _retriever
 
 
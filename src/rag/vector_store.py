@@ -13,7 +13,7 @@ import chromadb
 from chromadb.config import Settings as ChromaSettings
 
 from src.config.settings import settings
-from .embedder import get_embedder
+from .embedder import get_embedder, embed_text
 
 
 # ChromaDB storage path
@@ -137,7 +137,8 @@ class VectorStore:
         query: str,
         collection: str,
         k: int = 5,
-        filter_metadata: Optional[Dict[str, Any]] = None
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[SearchResult]:
         """
         Search for similar documents.
@@ -147,6 +148,7 @@ class VectorStore:
             collection: Collection to search
             k: Number of results to return
             filter_metadata: Optional metadata filter
+            query_embedding: Precomputed embedding of query (skips embedding)
             
         Returns:
             List of SearchResult objects
@@ -157,8 +159,8 @@ class VectorStore:
             return []
         
         # Get query embedding
-        embedder = get_embedder()
-        query_embedding = embedder.embed_query(query)
+        if query_embedding is None:
+            query_embedding = embed_text(query)
         
         # Build query args
         query_args = {
@@ -0,0 +1,148 @@
+"""
+Semantic Cache: Reuse LLM outputs across near-duplicate questions.
+
+Analysts phrase the same question many ways ("deposits by channel" vs
+"total deposits per channel"). This cache embeds each question and, on
+lookup, returns a stored value when a previous question in the same
+namespace has cosine similarity >= the configured threshold.
+
+Every entry also carries a `guard` string that must match exactly (e.g. a
+hash of the definition or of the SQL + data). Paraphrases can therefore
+only reuse an answer that was produced from identical inputs.
+
+Usage:
+    value = lookup(question, "sql", guard=definition_hash)
+    if value is None:
+        value = call_llm(...)
+        store(question, "sql", value, guard=definition_hash)
+"""
+
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import orjson
+
+from src.config.settings import settings
+from src.rag.embedder import embed_text
+
+
+# Maximum entries kept per namespace (oldest evicted first)
+MAX_ENTRIES_PER_NAMESPACE = 512
+
+
+@dataclass
+class _Namespace:
+    """Embeddings and values for one namespace (e.g. "sql")."""
+    vectors: np.ndarray = field(default_factory=lambda: np.empty((0, 0), dtype=np.float32))
+    guards: List[str] = field(default_factory=list)
+    values: List[bytes] = field(default_factory=list)
+
+
+_namespaces: Dict[str, _Namespace] = {}
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=256)
+def _embed(question: str) -> np.ndarray:
+    """Embed and L2-normalize a question (memoized so lookup+store embed once)."""
+    vector = np.asarray(embed_text(question), dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    vector.setflags(write=False)
+    return vector
+
+
+def lookup(question: str, namespace: str, guard: str = "") -> Optional[Dict[str, Any]]:
+    """
+    Find a cached value for a semantically similar question.
+
+    Args:
+        question: Question text to match
+        namespace: Cache partition (e.g. "sql", "explanation")
+        guard: Exact-match key the cached entry must share
+
+    Returns:
+        A fresh copy of the cached value, or None on a miss (or if the
+        embedding could not be computed)
+    """
+    if not settings.semantic_cache_enabled or not question:
+        return None
+
+    with _lock:
+        ns = _namespaces.get(namespace)
+        if ns is None or not ns.values:
+            return None
+
+    try:
+        query = _embed(question)
+    except Exception:
+        return None
+
+    with _lock:
+        if ns.vectors.shape[1] != query.shape[0]:
+            return None
+
+        scores = ns.vectors @ query
+        candidates = [i for i, g in enumerate(ns.guards) if g == guard]
+        if not candidates:
+            return None
+
+        best = max(candidates, key=lambda i: scores[i])
+        if scores[best] < settings.semantic_cache_threshold:
+            return None
+        payload = ns.values[best]
+
+    return orjson.loads(payload)
+
+
+def store(question: str, namespace: str, value: Dict[str, Any], guard: str = "") -> None:
+    """
+    Store a value for a question.
+
+    Args:
+        question: Question text the value answers
+        namespace: Cache partition (e.g. "sql", "explanation")
+        value: JSON-serializable dict to cache
+        guard: Exact-match key required on lookup
+    """
+    if not settings.semantic_cache_enabled or not question:
+        return
+
+    try:
+        vector = _embed(question)
+    except Exception:
+        return
+
+    payload = orjson.dumps(value, default=str)
+
+    with _lock:
+        ns = _namespaces.setdefault(namespace, _Namespace())
+        if ns.values and ns.vectors.shape[1] != vector.shape[0]:
+            # Embedding model changed; start the namespace over
+            ns = _namespaces[namespace] = _Namespace()
+
+        if ns.values:
+            ns.vectors = np.vstack([ns.vectors, vector])
+        else:
+            ns.vectors = vector.reshape(1, -1).copy()
+        ns.guards.append(guard)
+        ns.values.append(payload)
+
+        overflow = len(ns.values) - MAX_ENTRIES_PER_NAMESPACE
+        if overflow > 0:
+            ns.vectors = ns.vectors[overflow:]
+            del ns.guards[:overflow]
+            del ns.values[:overflow]
+
+
+def clear(namespace: Optional[str] = None) -> None:
+    """Clear one namespace, or all of them if none is given."""
+    with _lock:
+        if namespace is None:
+            _namespaces.clear()
+        else:
+            _namespaces.pop(namespace, None)
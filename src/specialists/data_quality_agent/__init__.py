@@ -1,4 +1,4 @@
 # Data Quality Agent
-from .agent import run
+from .agent import run, run_bytes
 
-__all__ = ["run"]
+__all__ = ["run", "run_bytes"]
@@ -8,10 +8,14 @@ Responsibilities:
 - Enforce privacy thresholds (k-anonymity)
 """
 
-from typing import Dict, Any, List
+from array import array
+from operator import attrgetter
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+import orjson
+
 from src.config.prompts import PRIVACY_THRESHOLD, get_privacy_rules
 
 
@@ -22,13 +26,25 @@ class QualityStatus(Enum):
     FAIL = "fail"
 
 
-@dataclass
+@dataclass(slots=True)
 class QualityCheck:
     """Result of a single quality check."""
     name: str
     status: QualityStatus
     message: str
-    details: Dict[str, Any] = None
+    details: Optional[Dict[str, Any]] = None
+
+
+# Fields serialized for each check, fetched in one C-level call
+_CHECK_FIELDS = attrgetter("name", "status", "message", "details")
+
+
+def _checks_to_dicts(checks: List[QualityCheck]) -> List[Dict[str, Any]]:
+    """Serialize quality checks to plain dicts."""
+    return [
+        {"name": name, "status": status.value, "message": message, "details": details}
+        for name, status, message, details in map(_CHECK_FIELDS, checks)
+    ]
 
 
 def run(state: Dict[str, Any]) -> Dict[str, Any]:
@@ -100,15 +116,7 @@ def run(state: Dict[str, Any]) -> Dict[str, Any]:
         "quality_result": {
             "status": overall_status.value,
             "message": overall_message,
-            "checks": [
-                {
-                    "name": c.name,
-                    "status": c.status.value,
-                    "message": c.message,
-                    "details": c.details
-                }
-                for c in checks
-            ],
+            "checks": _checks_to_dicts(checks),
             "privacy_compliance": {
                 "k_anonymity_met": k_anonymity_met,
                 "threshold": PRIVACY_THRESHOLD,
@@ -118,6 +126,23 @@ def run(state: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def run_bytes(state: Dict[str, Any]) -> bytes:
+    """
+    Execute the Data Quality Agent and return the result JSON-encoded.
+    
+    For callers that only forward the result onward, this avoids a second
+    Python-level walk of the dict. Values orjson cannot encode natively
+    (e.g. Decimal) are stringified.
+    
+    Args:
+        state: Current state with sql_result
+        
+    Returns:
+        UTF-8 JSON bytes of the dict returned by run()
+    """
+    return orjson.dumps(run(state), default=str)
+
+
 def _check_has_data(result: Dict, sql_query: str = "") -> QualityCheck:
     """Check that result has data."""
     data = result.get("data", [])
@@ -163,14 +188,17 @@ def _check_null_values(result: Dict) -> QualityCheck:
             message="No data to check"
         )
     
-    null_counts = {col: 0 for col in columns}
+    # Count into an indexed int buffer instead of a per-cell dict store
+    counts = array("i", [0] * len(columns))
+    indexed_columns = list(enumerate(columns))
     
     for row in data:
-        for col in columns:
-            if row.get(col) is None:
-                null_counts[col] += 1
+        get = row.get
+        for i, col in indexed_columns:
+            if get(col) is None:
+                counts[i] += 1
     
-    cols_with_nulls = {k: v for k, v in null_counts.items() if v > 0}
+    cols_with_nulls = {col: counts[i] for i, col in indexed_columns if counts[i] > 0}
     
     if cols_with_nulls:
         return QualityCheck(
@@ -229,19 +257,24 @@ def _check_numeric_values(result: Dict) -> QualityCheck:
             message="No data to check"
         )
     
+    # Only count columns are checked (for negatives); skip the scan otherwise
+    count_columns = [c for c in columns if "count" in c.lower()]
+    if not count_columns:
+        return QualityCheck(
+            name="numeric_check",
+            status=QualityStatus.PASS,
+            message="Numeric values look reasonable"
+        )
+    
     issues = []
     
-    for col in columns:
-        values = [row.get(col) for row in data if isinstance(row.get(col), (int, float))]
-        
-        if not values:
-            continue
-        
-        # Check for negative values in count columns
-        if "count" in col.lower():
-            negatives = [v for v in values if v < 0]
-            if negatives:
-                issues.append(f"Column '{col}' has {len(negatives)} negative value(s)")
+    for col in count_columns:
+        negatives = sum(
+            1 for row in data
+            if isinstance(row.get(col), (int, float)) and row[col] < 0
+        )
+        if negatives:
+            issues.append(f"Column '{col}' has {negatives} negative value(s)")
     
     if issues:
         return QualityCheck(
@@ -11,8 +11,8 @@ Responsibilities:
 - Flag privacy concerns early
 """
 
-import json
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Tuple
 from pathlib import Path
 
 from src.config.llm import get_llm_client
@@ -20,6 +20,26 @@ from src.config.prompts import AgentPrompts
 from src.rag import get_retriever, RAGRetriever
 
 
+@lru_cache(maxsize=512)
+def _retrieve_cached(question: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Retrieve RAG context for a question, memoized per question text.
+    
+    Failures raise and are therefore never cached.
+    
+    Returns:
+        Tuple of (context string, metadata summary)
+    """
+    retriever = get_retriever()
+    rag_result = retriever.retrieve_for_definition(question)
+    return rag_result.get_context_string(max_chunks=8), rag_result.get_metadata_summary()
+
+
+def clear_rag_cache() -> None:
+    """Clear cached retrievals (call after re-indexing the knowledge base)."""
+    _retrieve_cached.cache_clear()
+
+
 def run(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Execute the Definition Agent with RAG-augmented context.
@@ -42,10 +62,8 @@ def run(state: Dict[str, Any]) -> Dict[str, Any]:
     
     # --- RAG: Retrieve relevant context ---
     try:
-        retriever = get_retriever()
-        rag_result = retriever.retrieve_for_definition(question)
-        rag_context = rag_result.get_context_string(max_chunks=8)
-        rag_metadata = rag_result.get_metadata_summary()
+        rag_context, rag_metadata = _retrieve_cached(question)
+        rag_metadata = dict(rag_metadata)
     except Exception as e:
         # If RAG fails, continue without context
         rag_context = ""
@@ -1,4 +1,4 @@
 # Explanation Agent
-from .agent import run
+from .agent import run, run_batch, run_async, run_many_async, stream
 
-__all__ = ["run"]
+__all__ = ["run", "run_batch", "run_async", "run_many_async", "stream"]
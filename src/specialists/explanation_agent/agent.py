@@ -9,23 +9,266 @@ Responsibilities:
 - Note any privacy suppressions
 """
 
+import io
+import re
+import asyncio
 import json
-from typing import Dict, Any, List
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from operator import itemgetter
+from typing import AbstractSet, Dict, Any, List, Optional, Set, Tuple, AsyncIterator
 from pathlib import Path
 
-from src.config.llm import get_llm_client
+import orjson
+
+from src.config.llm import get_llm_client, gather_limited, json_schema_format, LLMResponse
 from src.config.prompts import AgentPrompts
+from src.specialists import _semantic_cache
 
 
-def run(state: Dict[str, Any]) -> Dict[str, Any]:
+# Exact-match cache of explanations, keyed by a hash of the full prompt
+EXPLANATION_CACHE_SIZE = 256
+_explanation_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_explanation_cache_lock = threading.Lock()
+
+
+def _explanation_cache_key(system_prompt: str, user_prompt: str) -> str:
+    """Hash the prompts into a cache key."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(system_prompt.encode())
+    digest.update(b"\x00")
+    digest.update(user_prompt.encode())
+    return digest.hexdigest()
+
+
+def _get_cached_explanation(key: str) -> Optional[Dict[str, Any]]:
+    """Return a fresh copy of a cached explanation, or None on a miss."""
+    with _explanation_cache_lock:
+        payload = _explanation_cache.get(key)
+        if payload is None:
+            return None
+        _explanation_cache.move_to_end(key)
+    return orjson.loads(payload)
+
+
+def _store_explanation(key: str, explanation: Dict[str, Any]) -> None:
+    """Store an explanation, evicting the least recently used entry if full."""
+    payload = orjson.dumps(explanation, default=str)
+    with _explanation_cache_lock:
+        _explanation_cache[key] = payload
+        _explanation_cache.move_to_end(key)
+        while len(_explanation_cache) > EXPLANATION_CACHE_SIZE:
+            _explanation_cache.popitem(last=False)
+
+
+def _semantic_guard(sql_query: str, data_json: str, quality_status: str) -> str:
+    """Exact-match guard for semantic reuse: same SQL, data, and quality status."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (sql_query, data_json, quality_status):
+        digest.update(part.encode())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def clear_explanation_cache() -> None:
+    """Drop all cached explanations."""
+    with _explanation_cache_lock:
+        _explanation_cache.clear()
+
+
+# Maximum queries explained in one batched LLM call (accuracy drops on longer contexts)
+MAX_BATCH_SIZE = 16
+
+# Output token budget per query in a batched call; the default max_tokens
+# fits one explanation, so a full batch would be truncated without this
+BATCH_TOKENS_PER_QUERY = 600
+
+# Output schema (matches prompts/agents/explanation.md) enforced via Structured Outputs
+EXPLANATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "insights": {"type": "array", "items": {"type": "string"}},
+        "caveats": {"type": "array", "items": {"type": "string"}},
+        "assumptions": {"type": "array", "items": {"type": "string"}},
+        "follow_up_questions": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["summary", "insights", "caveats", "assumptions", "follow_up_questions"],
+    "additionalProperties": False
+}
+EXPLANATION_RESPONSE_FORMAT = json_schema_format("explanation", EXPLANATION_SCHEMA)
+BATCH_RESPONSE_FORMAT = json_schema_format("explanation_batch", {
+    "type": "object",
+    "properties": {"explanations": {"type": "array", "items": EXPLANATION_SCHEMA}},
+    "required": ["explanations"],
+    "additionalProperties": False
+})
+
+_EXPLANATION_REMINDERS = """Remember:
+- Never mention specific customer or account IDs
+- Note any assumptions made (time range, metric definitions)
+- If any data was suppressed for privacy, mention it
+- Format numbers clearly with commas (e.g., 18,504)
+- IMPORTANT: Do NOT use $ for currency - use "USD" or just the number ($ breaks markdown rendering)"""
+
+
+def _no_data_explanation(quality_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the explanation for a query that returned no data."""
+    # Check if this is due to privacy filtering
+    has_data_check = next(
+        (c for c in quality_result.get("checks", []) if c.get("name") == "has_data"),
+        {}
+    )
+    likely_cause = has_data_check.get("details", {}).get("likely_cause", "")
+    
+    if likely_cause == "k_anonymity_filter":
+        return {
+            "summary": "This breakdown cannot be shown due to privacy protection requirements.",
+            "insights": [
+                "The requested data exists but involves too few accounts to report safely.",
+                "Our privacy policy requires at least 5 distinct accounts per data bucket."
+            ],
+            "caveats": [
+                "Some data was suppressed to protect individual privacy.",
+                "This is not an error - it's a privacy safeguard."
+            ],
+            "assumptions": [],
+            "follow_up_questions": [
+                "Try a broader aggregation (e.g., quarterly totals instead of monthly)",
+                "Ask for overall totals without dimensional breakdowns",
+                "Combine with other categories that have more data"
+            ]
+        }
+    
+    return {
+        "summary": "Unable to generate results for this question.",
+        "insights": [],
+        "caveats": ["The query returned no data or encountered an error."],
+        "assumptions": [],
+        "follow_up_questions": ["Try rephrasing your question or checking the date range."]
+    }
+
+
+# Data preview budget for the prompt
+PREVIEW_MAX_ROWS = 10
+PREVIEW_MAX_CELL_CHARS = 50
+
+
+def _is_number(value: Any) -> bool:
+    """Check for a numeric (non-bool) cell value."""
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+
+def _preview_indices(data: List[Dict[str, Any]], columns: List[str], max_rows: int) -> List[int]:
     """
-    Execute the Explanation Agent.
+    Pick which rows to show when a result exceeds the preview budget.
+    
+    Always includes the rows holding the min and max of the first numeric
+    column, then fills the budget with evenly spaced rows so the preview
+    spans the whole result (not just its first time slice or category).
+    Returned indices are in original row order.
+    """
+    n = len(data)
+    if n <= max_rows:
+        return list(range(n))
+    
+    picked = set()
+    
+    numeric_col = next((c for c in columns if _is_number(data[0].get(c))), None)
+    if numeric_col is not None:
+        numeric = [i for i in range(n) if _is_number(data[i].get(numeric_col))]
+        if numeric:
+            picked.add(min(numeric, key=lambda i: data[i][numeric_col]))
+            picked.add(max(numeric, key=lambda i: data[i][numeric_col]))
+    
+    remaining = max_rows - len(picked)
+    if remaining > 0:
+        step = (n - 1) / max(remaining - 1, 1)
+        picked.update(round(k * step) for k in range(remaining))
+    
+    # Even steps can land on the min/max rows; top up with unused rows
+    for i in range(n):
+        if len(picked) >= max_rows:
+            break
+        picked.add(i)
+    
+    return sorted(picked)[:max_rows]
+
+
+def _compress_rows(
+    data: List[Dict[str, Any]],
+    max_rows: int = PREVIEW_MAX_ROWS,
+    max_cell: int = PREVIEW_MAX_CELL_CHARS
+) -> List[Dict[str, Any]]:
+    """
+    Shrink result rows to a token-efficient preview for the prompt.
+    
+    - Long string cells are truncated to max_cell characters
+    - Columns with the same value in every row are reported once
+    - Results longer than max_rows are sampled (see _preview_indices) and
+      summarized with min/max/mean/sum per numeric column over all rows
+    
+    Constant columns and stats go into a trailing {"_summary": ...} row,
+    so no information is silently dropped.
+    """
+    if not data:
+        return []
+    
+    def cell(value: Any) -> Any:
+        if isinstance(value, str) and len(value) > max_cell:
+            return value[:max_cell] + "…"
+        return value
+    
+    columns = list(data[0].keys())
+    
+    constant = {}
+    if len(data) > 1:
+        for col in columns:
+            first = data[0].get(col)
+            if all(row.get(col) == first for row in data):
+                constant[col] = first
+        if len(constant) == len(columns):
+            constant = {}
+    kept = [c for c in columns if c not in constant]
+    
+    indices = _preview_indices(data, kept, max_rows)
+    preview = [{c: cell(data[i].get(c)) for c in kept} for i in indices]
+    
+    summary: Dict[str, Any] = {}
+    if constant:
+        summary["constant_columns"] = {c: cell(v) for c, v in constant.items()}
+    
+    if len(indices) < len(data):
+        stats = {}
+        for col in kept:
+            values = [float(row[col]) for row in data if _is_number(row.get(col))]
+            if values:
+                total = sum(values)
+                stats[col] = {
+                    "min": min(values),
+                    "max": max(values),
+                    "mean": round(total / len(values), 4),
+                    "sum": round(total, 4)
+                }
+        summary["sampled_rows"] = f"{len(indices)} of {len(data)} rows shown, spread across the result"
+        if stats:
+            summary["all_rows_stats"] = stats
+    
+    if summary:
+        preview.append({"_summary": summary})
+    
+    return preview
+
+
+def _format_query_section(state: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Format one query's question, SQL, results, and quality for the prompt.
     
-    Args:
-        state: Current state with question, sql_result, and quality_result
-        
     Returns:
-        dict with explanation containing summary, insights, and follow-ups
+        Tuple of (prompt section, serialized data preview)
     """
     question = state.get("user_question", "")
     sql_query = state.get("sql_query", "")
@@ -33,55 +276,13 @@ def run(state: Dict[str, Any]) -> Dict[str, Any]:
     quality_result = state.get("quality_result") or {}
     sql_explanation = state.get("sql_explanation", "")
     
-    # Handle missing results
-    if not sql_result or not sql_result.get("data"):
-        # Check if this is due to privacy filtering
-        has_data_check = next(
-            (c for c in quality_result.get("checks", []) if c.get("name") == "has_data"),
-            {}
-        )
-        likely_cause = has_data_check.get("details", {}).get("likely_cause", "")
-        
-        if likely_cause == "k_anonymity_filter":
-            return {
-                "explanation": {
-                    "summary": "This breakdown cannot be shown due to privacy protection requirements.",
-                    "insights": [
-                        "The requested data exists but involves too few accounts to report safely.",
-                        "Our privacy policy requires at least 5 distinct accounts per data bucket."
-                    ],
-                    "caveats": [
-                        "Some data was suppressed to protect individual privacy.",
-                        "This is not an error - it's a privacy safeguard."
-                    ],
-                    "assumptions": [],
-                    "follow_up_questions": [
-                        "Try a broader aggregation (e.g., quarterly totals instead of monthly)",
-                        "Ask for overall totals without dimensional breakdowns",
-                        "Combine with other categories that have more data"
-                    ]
-                }
-            }
-        
-        return {
-            "explanation": {
-                "summary": "Unable to generate results for this question.",
-                "insights": [],
-                "caveats": ["The query returned no data or encountered an error."],
-                "assumptions": [],
-                "follow_up_questions": ["Try rephrasing your question or checking the date range."]
-            }
-        }
-    
-    # Get composed prompt
-    system_prompt = AgentPrompts.explanation()
-    
     # Format result data for the prompt
     data = sql_result.get("data", [])
     row_count = sql_result.get("row_count", 0)
     
     # Limit data shown to LLM
-    data_preview = data[:20] if len(data) > 20 else data
+    data_preview = _compress_rows(data)
+    data_json = json.dumps(data_preview, separators=(",", ":"), ensure_ascii=False, default=str)
     
     # Privacy compliance info
     privacy_info = quality_result.get("privacy_compliance", {})
@@ -89,9 +290,7 @@ def run(state: Dict[str, Any]) -> Dict[str, Any]:
     if privacy_info.get("concerns"):
         privacy_note = f"\n\nPrivacy notes: {privacy_info['concerns']}"
     
-    user_prompt = f"""Explain these query results in business-friendly language.
-
-**Original Question:** "{question}"
+    section = f"""**Original Question:** "{question}"
 
 **SQL Query:** 
 ```sql
@@ -102,54 +301,495 @@ def run(state: Dict[str, Any]) -> Dict[str, Any]:
 
 **Results ({row_count} rows):**
 ```json
-{json.dumps(data_preview, indent=2, default=str)}
+{data_json}
 ```
 
 **Data Quality:** {quality_result.get('status', 'unknown')} - {quality_result.get('message', '')}
-{privacy_note}
+{privacy_note}"""
+    
+    return section, data_json
 
-Remember:
-- Never mention specific customer or account IDs
-- Note any assumptions made (time range, metric definitions)
-- If any data was suppressed for privacy, mention it
-- Format numbers clearly with commas (e.g., 18,504)
-- IMPORTANT: Do NOT use $ for currency - use "USD" or just the number ($ breaks markdown rendering)
+
+def _has_data(state: Dict[str, Any]) -> bool:
+    """Check whether the state carries SQL result rows to explain."""
+    sql_result = state.get("sql_result") or {}
+    return bool(sql_result.get("data"))
+
+
+@dataclass
+class _ExplanationRequest:
+    """Prompts and cache keys for one explanation LLM call."""
+    question: str
+    system_prompt: str
+    user_prompt: str
+    cache_key: str
+    semantic_guard: str
+
+
+def _prepare(state: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[_ExplanationRequest]]:
+    """
+    Resolve an explanation locally, or build the LLM request for it.
+    
+    Returns:
+        (explanation, None) when no LLM call is needed (no data, cache hit),
+        otherwise (None, request)
+    """
+    question = state.get("user_question", "")
+    sql_query = state.get("sql_query", "")
+    quality_result = state.get("quality_result") or {}
+    
+    # Handle missing results
+    if not _has_data(state):
+        return _no_data_explanation(quality_result), None
+    
+    # Get composed prompt
+    system_prompt = AgentPrompts.explanation()
+    
+    section, data_json = _format_query_section(state)
+    
+    user_prompt = f"""Explain these query results in business-friendly language.
+
+{section}
+
+{_EXPLANATION_REMINDERS}
 
 Generate a business-friendly explanation as JSON with: summary, insights, caveats, assumptions, follow_up_questions"""
     
+    # Identical prompt -> identical answer; skip the LLM call on a hit
+    cache_key = _explanation_cache_key(system_prompt, user_prompt)
+    cached = _get_cached_explanation(cache_key)
+    if cached is not None:
+        cached["_tokens"] = {}
+        cached["_cache_hit"] = True
+        return cached, None
+    
+    # Rephrased question over the same SQL and data -> reuse the explanation
+    semantic_guard = _semantic_guard(sql_query or "", data_json, quality_result.get("status", ""))
+    cached = _semantic_cache.lookup(question, "explanation", guard=semantic_guard)
+    if cached is not None:
+        cached["_tokens"] = {}
+        cached["_cache_hit"] = "semantic"
+        return cached, None
+    
+    return None, _ExplanationRequest(
+        question=question,
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
+        cache_key=cache_key,
+        semantic_guard=semantic_guard
+    )
+
+
+def _finish(request: _ExplanationRequest, response: LLMResponse) -> Dict[str, Any]:
+    """Parse the LLM response into an explanation and populate the caches."""
+    result = response.to_json()
+    
+    if result is None:
+        result = {
+            "summary": response.content,
+            "insights": [],
+            "caveats": [],
+            "assumptions": [],
+            "follow_up_questions": []
+        }
+    else:
+        _store_explanation(request.cache_key, result)
+        _semantic_cache.store(request.question, "explanation", result, guard=request.semantic_guard)
+    
+    result["_tokens"] = response.usage
+    
+    return result
+
+
+def _error_explanation(error: Exception) -> Dict[str, Any]:
+    """Build the explanation returned when the LLM call fails."""
+    return {
+        "summary": f"Error generating explanation: {str(error)}",
+        "insights": [],
+        "caveats": ["An error occurred while processing results."],
+        "assumptions": [],
+        "follow_up_questions": []
+    }
+
+
+def run(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Execute the Explanation Agent.
+    
+    Args:
+        state: Current state with question, sql_result, and quality_result
+        
+    Returns:
+        dict with explanation containing summary, insights, and follow-ups
+    """
+    explanation, request = _prepare(state)
+    if request is None:
+        return {"explanation": explanation}
+    
+    try:
+        client = get_llm_client()
+        response = client.complete(
+            system_prompt=request.system_prompt,
+            user_prompt=request.user_prompt,
+            prompt_cache_key="explanation_agent",
+            response_format=EXPLANATION_RESPONSE_FORMAT
+        )
+        return {"explanation": _finish(request, response)}
+        
+    except Exception as e:
+        return {"explanation": _error_explanation(e)}
+
+
+async def run_async(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async version of run(): awaits the LLM instead of blocking a thread.
+    
+    Args:
+        state: Current state with question, sql_result, and quality_result
+        
+    Returns:
+        dict with explanation containing summary, insights, and follow-ups
+    """
+    # _prepare/_finish hit the embedding and cache stores, so keep them off the event loop
+    explanation, request = await asyncio.to_thread(_prepare, state)
+    if request is None:
+        return {"explanation": explanation}
+    
+    try:
+        client = get_llm_client()
+        response = await client.acomplete(
+            system_prompt=request.system_prompt,
+            user_prompt=request.user_prompt,
+            prompt_cache_key="explanation_agent",
+            response_format=EXPLANATION_RESPONSE_FORMAT
+        )
+        return {"explanation": await asyncio.to_thread(_finish, request, response)}
+        
+    except Exception as e:
+        return {"explanation": _error_explanation(e)}
+
+
+async def run_many_async(states: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Explain several independent results concurrently.
+    
+    At most MAX_CONCURRENT_LLM_CALLS requests are in flight at once.
+    
+    Returns:
+        List of run() outputs, in the same order as states
+    """
+    return await gather_limited(run_async(state) for state in states)
+
+
+def run_batch(states: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Explain several independent query results with shared LLM calls.
+    
+    Queries with data are grouped (up to MAX_BATCH_SIZE per call) under a
+    single system prompt instead of one call each. Queries without data
+    are answered locally, as in run(). If a batched response cannot be
+    parsed, that group falls back to one run() call per query.
+    
+    Args:
+        states: List of states, each shaped like run()'s input
+        
+    Returns:
+        List of dicts with explanation, in the same order as states.
+        Token usage for a batched call is reported on its first item only.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(states)
+    pending = []
+    
+    for i, state in enumerate(states):
+        if _has_data(state):
+            pending.append(i)
+        else:
+            results[i] = {"explanation": _no_data_explanation(state.get("quality_result") or {})}
+    
+    for start in range(0, len(pending), MAX_BATCH_SIZE):
+        group = pending[start:start + MAX_BATCH_SIZE]
+        explanations = _explain_group([states[i] for i in group])
+        for i, explanation in zip(group, explanations):
+            results[i] = explanation
+    
+    return results
+
+
+def _explain_group(states: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Explain up to MAX_BATCH_SIZE states (all with data) in one LLM call."""
+    if len(states) == 1:
+        return [run(states[0])]
+    
+    system_prompt = AgentPrompts.explanation()
+    
+    sections = []
+    for n, state in enumerate(states, start=1):
+        section, _ = _format_query_section(state)
+        sections.append(f"### Query {n}\n\n{section}")
+    queries_text = "\n\n".join(sections)
+    
+    user_prompt = f"""Explain each of these {len(states)} independent query results in business-friendly language.
+
+{queries_text}
+
+{_EXPLANATION_REMINDERS}
+
+Return JSON of the form {{"explanations": [...]}} with exactly {len(states)} items, in query order.
+Each item must have: summary, insights, caveats, assumptions, follow_up_questions"""
+    
     try:
         client = get_llm_client()
         response = client.complete(
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-            json_mode=True
+            prompt_cache_key="explanation_agent",
+            response_format=BATCH_RESPONSE_FORMAT,
+            max_tokens=BATCH_TOKENS_PER_QUERY * len(states)
         )
         
-        result = response.to_json()
+        parsed = response.to_json() or {}
+        explanations = parsed.get("explanations")
+        
+        if not isinstance(explanations, list) or len(explanations) != len(states) \
+                or not all(isinstance(e, dict) for e in explanations):
+            return [run(state) for state in states]
         
-        if result is None:
-            result = {
-                "summary": response.content,
-                "insights": [],
-                "caveats": [],
-                "assumptions": [],
-                "follow_up_questions": []
-            }
+        for n, explanation in enumerate(explanations):
+            explanation["_tokens"] = response.usage if n == 0 else {}
+            explanation["_batch_size"] = len(states)
         
-        result["_tokens"] = response.usage
+        return [{"explanation": e} for e in explanations]
         
-        return {"explanation": result}
+    except Exception:
+        return [run(state) for state in states]
+
+
+# Locate the start of the streamed fields we render incrementally
+_SUMMARY_KEY = re.compile(r'"summary"\s*:\s*"')
+_INSIGHTS_KEY = re.compile(r'"insights"\s*:\s*\[')
+
+# Characters re-searched on the next chunk in case a key straddles two chunks
+_KEY_OVERLAP = 32
+
+# Stream section headers, in the order they are rendered
+ANSWER_HEADER = "**Answer:** "
+INSIGHTS_HEADER = "**Key Insights:**\n"
+
+
+def _read_json_string(buf: str, quote_pos: int, start: Optional[int] = None) -> Tuple[Optional[str], int]:
+    """
+    Decode the JSON string literal opening at buf[quote_pos].
+    
+    Args:
+        buf: Text seen so far
+        quote_pos: Index of the opening quote
+        start: Index to resume scanning from (returned by a previous call)
+    
+    Returns:
+        (value, index after the closing quote), or (None, index to resume
+        from) if the string is not closed yet
+    """
+    i = quote_pos + 1 if start is None else start
+    end = len(buf)
+    while i < end:
+        ch = buf[i]
+        if ch == "\\":
+            if i + 1 == end:
+                break
+            i += 2
+            continue
+        if ch == '"':
+            return json.loads(buf[quote_pos:i + 1]), i + 1
+        i += 1
+    return None, i
+
+
+class _StreamingExplanationParser:
+    """
+    Incrementally extract summary and insights from streamed JSON.
+    
+    feed() returns markdown fragments (formatted like format_answer) for
+    each field that completed in the text seen so far. Scan positions are
+    kept between calls, so each chunk is examined once.
+    """
+    
+    def __init__(self):
+        self._buf = ""
+        self._summary_from = 0
+        self._summary_quote: Optional[int] = None
+        self._summary_scan: Optional[int] = None
+        self._summary_done = False
+        self._insights_from = 0
+        self._insights_pos: Optional[int] = None
+        self._item_scan: Optional[int] = None
+        self._insights_done = False
+        self.headers_sent: Set[str] = set()
+    
+    @property
+    def emitted(self) -> bool:
+        """Whether any fragment has been returned yet."""
+        return bool(self.headers_sent)
+    
+    def _find_key(self, pattern: re.Pattern, start: int) -> Tuple[Optional[int], int]:
+        """Search for a key from start; returns (match end or None, next start)."""
+        match = pattern.search(self._buf, start)
+        if match:
+            return match.end(), start
+        return None, max(start, len(self._buf) - _KEY_OVERLAP)
+    
+    def feed(self, text: str) -> List[str]:
+        self._buf += text
+        buf = self._buf
+        fragments = []
+        
+        if not self._summary_done:
+            if self._summary_quote is None:
+                end, self._summary_from = self._find_key(_SUMMARY_KEY, self._summary_from)
+                if end is not None:
+                    self._summary_quote = end - 1
+            if self._summary_quote is not None:
+                value, self._summary_scan = _read_json_string(buf, self._summary_quote, self._summary_scan)
+                if value is not None:
+                    self._summary_done = True
+                    self.headers_sent.add(ANSWER_HEADER)
+                    fragments.append(f"{ANSWER_HEADER}{value}\n\n")
+        
+        if not self._insights_done:
+            if self._insights_pos is None:
+                self._insights_pos, self._insights_from = self._find_key(_INSIGHTS_KEY, self._insights_from)
+            
+            while self._insights_pos is not None:
+                pos = self._insights_pos
+                if self._item_scan is None:
+                    while pos < len(buf) and buf[pos] in " \t\r\n,":
+                        pos += 1
+                    self._insights_pos = pos
+                    if pos >= len(buf):
+                        break
+                    if buf[pos] != '"':
+                        # End of the array (or non-string items we don't stream)
+                        self._insights_done = True
+                        if INSIGHTS_HEADER in self.headers_sent:
+                            fragments.append("\n")
+                        break
+                value, end = _read_json_string(buf, pos, self._item_scan)
+                if value is None:
+                    self._item_scan = end
+                    break
+                if INSIGHTS_HEADER not in self.headers_sent:
+                    self.headers_sent.add(INSIGHTS_HEADER)
+                    fragments.append(INSIGHTS_HEADER)
+                fragments.append(f"- {value}\n")
+                self._insights_pos = end
+                self._item_scan = None
         
+        return fragments
+
+
+def _explanation_fragments(explanation: Dict[str, Any], headers_sent: AbstractSet[str] = frozenset()) -> List[str]:
+    """
+    Render summary and insights of a complete explanation as stream fragments.
+    
+    Args:
+        explanation: Explanation dict
+        headers_sent: Section headers already streamed, which are not repeated
+    """
+    answer = "" if ANSWER_HEADER in headers_sent else ANSWER_HEADER
+    fragments = [f"{answer}{explanation.get('summary', 'No summary available.')}\n\n"]
+    insights = explanation.get("insights", [])
+    if insights:
+        if INSIGHTS_HEADER not in headers_sent:
+            fragments.append(INSIGHTS_HEADER)
+        fragments.extend(f"- {insight}\n" for insight in insights)
+        fragments.append("\n")
+    return fragments
+
+
+async def stream(state: Dict[str, Any]) -> AsyncIterator[str]:
+    """
+    Stream the explanation's summary and insights as markdown fragments.
+    
+    Fragments are yielded as soon as each field closes in the LLM output,
+    so the UI can render the answer before generation finishes. When the
+    stream ends, the full explanation is cached: a following run(state)
+    returns the complete dict without another LLM call.
+    
+    Args:
+        state: Current state with question, sql_result, and quality_result
+        
+    Yields:
+        Markdown fragments ready to append to the answer
+    """
+    explanation, request = await asyncio.to_thread(_prepare, state)
+    if request is None:
+        for fragment in _explanation_fragments(explanation):
+            yield fragment
+        return
+    
+    parser = _StreamingExplanationParser()
+    chunks = []
+    try:
+        client = get_llm_client()
+        async for text in client.astream(
+            system_prompt=request.system_prompt,
+            user_prompt=request.user_prompt,
+            prompt_cache_key="explanation_agent",
+            response_format=EXPLANATION_RESPONSE_FORMAT
+        ):
+            chunks.append(text)
+            for fragment in parser.feed(text):
+                yield fragment
     except Exception as e:
-        return {
-            "explanation": {
-                "summary": f"Error generating explanation: {str(e)}",
-                "insights": [],
-                "caveats": ["An error occurred while processing results."],
-                "assumptions": [],
-                "follow_up_questions": []
-            }
-        }
+        for fragment in _explanation_fragments(_error_explanation(e), parser.headers_sent):
+            yield fragment
+        return
+    
+    response = LLMResponse(content="".join(chunks), model=client.model_name, usage={})
+    result = await asyncio.to_thread(_finish, request, response)
+    
+    # Output that was not the expected JSON: show what we got
+    if not parser.emitted:
+        for fragment in _explanation_fragments(result):
+            yield fragment
+
+
+# Columns the answer table is sorted by (first match, ascending)
+TABLE_SORT_COLUMNS = ('month', 'date', 'event_date', 'year', 'quarter', 'week')
+
+
+def _format_table(data: List[Dict[str, Any]]) -> str:
+    """Render result rows as a markdown table (columns from the first row)."""
+    cols = list(data[0].keys()) if data else []
+    if not cols:
+        return ""  # itemgetter() needs at least one column
+    
+    # Pull each row into a tuple once; rows missing a column get ""
+    try:
+        getter = itemgetter(*cols)
+        rows = [getter(row) for row in data] if len(cols) > 1 else [(getter(row),) for row in data]
+    except KeyError:
+        rows = [tuple(row.get(c, "") for c in cols) for row in data]
+    
+    # Sort by date/month column if present (ascending)
+    sort_idx = next((i for i, c in enumerate(cols) if c in TABLE_SORT_COLUMNS), None)
+    if sort_idx is not None:
+        if all(isinstance(r[sort_idx], str) for r in rows):
+            rows.sort(key=itemgetter(sort_idx))
+        else:
+            rows.sort(key=lambda r: str(r[sort_idx]))
+    
+    sep = " | "
+    header = "| " + sep.join(cols) + " |\n| " + sep.join(["---"] * len(cols)) + " |"
+    body = "".join(["\n| " + sep.join(map(str, r)) + " |" for r in rows])
+    return header + body
+
+
+def _write_bullets(buf: io.StringIO, title: str, items: List[Any], prefix: str = "- ") -> None:
+    """Write a bold title followed by one bullet per item."""
+    buf.write(title)
+    buf.write("\n")
+    for item in items:
+        buf.write(f"{prefix}{item}\n")
 
 
 def format_answer(state: Dict[str, Any]) -> str:
@@ -166,83 +806,58 @@ def format_answer(state: Dict[str, Any]) -> str:
     sql_result = state.get("sql_result") or {}
     quality_result = state.get("quality_result") or {}
     
-    lines = []
+    buf = io.StringIO()
     
     # Summary
     summary = explanation.get("summary", "No summary available.")
-    lines.append(f"**Answer:** {summary}")
-    lines.append("")
+    buf.write(f"**Answer:** {summary}\n\n")
     
     # Insights
     insights = explanation.get("insights", [])
     if insights:
-        lines.append("**Key Insights:**")
-        for insight in insights:
-            lines.append(f"- {insight}")
-        lines.append("")
+        _write_bullets(buf, "**Key Insights:**", insights)
+        buf.write("\n")
     
     # Data table (if small and appropriate)
     data = sql_result.get("data", [])
     if data and len(data) <= 10:
-        lines.append("**Data:**")
-        if data:
-            cols = list(data[0].keys())
-            
-            # Sort by date/month column if present (ascending)
-            date_cols = [c for c in cols if c in ('month', 'date', 'event_date', 'year', 'quarter', 'week')]
-            if date_cols:
-                sort_col = date_cols[0]
-                data = sorted(data, key=lambda x: str(x.get(sort_col, '')))
-            
-            lines.append("| " + " | ".join(cols) + " |")
-            lines.append("| " + " | ".join(["---"] * len(cols)) + " |")
-            for row in data:
-                values = [str(row.get(c, "")) for c in cols]
-                lines.append("| " + " | ".join(values) + " |")
-            lines.append("")
+        buf.write("**Data:**\n")
+        buf.write(_format_table(data))
+        buf.write("\n\n")
     
     # Assumptions
     assumptions = explanation.get("assumptions", [])
     if assumptions:
-        lines.append("**Assumptions:**")
-        for assumption in assumptions:
-            lines.append(f"- {assumption}")
-        lines.append("")
+        _write_bullets(buf, "**Assumptions:**", assumptions)
+        buf.write("\n")
     
     # Caveats
     caveats = explanation.get("caveats", [])
     if caveats:
-        lines.append("**Notes:**")
-        for caveat in caveats:
-            lines.append(f"- {caveat}")
-        lines.append("")
+        _write_bullets(buf, "**Notes:**", caveats)
+        buf.write("\n")
     
     # Privacy warnings
     privacy_compliance = quality_result.get("privacy_compliance", {})
     if privacy_compliance.get("concerns"):
-        lines.append("**Privacy Notes:**")
-        lines.append("- Some breakdowns may be suppressed due to privacy thresholds")
-        lines.append("")
+        buf.write("**Privacy Notes:**\n")
+        buf.write("- Some breakdowns may be suppressed due to privacy thresholds\n\n")
     
     # Quality warnings
     if quality_result.get("status") == "warning":
         warnings = [c["message"] for c in quality_result.get("checks", []) 
                    if c["status"] == "warning" and "privacy" not in c["name"].lower()]
         if warnings:
-            lines.append("**Data Quality Notes:**")
-            for w in warnings:
-                lines.append(f"- ⚠️ {w}")
-            lines.append("")
+            _write_bullets(buf, "**Data Quality Notes:**", warnings, prefix="- ⚠️ ")
+            buf.write("\n")
     
     # Follow-up questions
     follow_ups = explanation.get("follow_up_questions", [])
     if follow_ups:
-        lines.append("**You might also ask:**")
-        for q in follow_ups:
-            lines.append(f"- {q}")
+        _write_bullets(buf, "**You might also ask:**", follow_ups)
     
-    return "\n".join(lines)
-
+    # Every section ends with a newline; drop the last one
+    return buf.getvalue()[:-1]
 
 if __name__ == "__main__":
     # Test the agent
@@ -0,0 +1,222 @@
+"""
+Fused Agent: Generate SQL and its explanation in a single LLM call.
+
+Optional fast path (enable with FUSED_MODE=1) that replaces the separate
+SQL Agent and Explanation Agent round-trips. The model returns the SQL
+together with an explanation *template*; after the query runs, the
+template is filled locally from the results with Jinja2.
+
+Falls back to the separate agents when:
+- The response cannot be parsed
+- The SQL fails validation or execution
+- The template is invalid or references unknown fields
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, Tuple
+
+from jinja2 import StrictUndefined, TemplateError
+from jinja2.sandbox import SandboxedEnvironment
+
+from src.config.llm import get_llm_client, json_schema_format
+from src.config.prompts import AgentPrompts
+from src.specialists.sql_agent import agent as sql_agent
+from src.specialists.data_quality_agent import agent as data_quality_agent
+from src.specialists.explanation_agent import agent as explanation_agent
+
+
+# Explanation fields the template may contain
+EXPLANATION_FIELDS = ["summary", "insights", "caveats", "assumptions", "follow_up_questions"]
+
+FUSED_RESPONSE_INSTRUCTIONS = """Return JSON with:
+- sql: the SQL query
+- explanation: what the SQL does
+- privacy_check: how privacy requirements are met
+- explanation_template: an object with summary, insights, caveats, assumptions, follow_up_questions
+  written for a business reader. You have not seen the results yet, so refer to them with
+  Jinja2 placeholders only:
+  - {{ row_count }}, {{ columns }}
+  - {{ top_row.<column> }} for the first result row
+  - {{ rows[i].<column> }} for row i
+  - {{ totals.<column> }} for the sum of a numeric column
+  - {{ value | number }} formats a number with thousands separators
+  Only reference columns your SQL returns. Do NOT use $ for currency."""
+
+FUSED_RESPONSE_FORMAT = json_schema_format("fused_response", {
+    "type": "object",
+    "properties": {
+        "sql": {"type": "string"},
+        "explanation": {"type": "string"},
+        "privacy_check": {"type": "string"},
+        "explanation_template": explanation_agent.EXPLANATION_SCHEMA
+    },
+    "required": ["sql", "explanation", "privacy_check", "explanation_template"],
+    "additionalProperties": False
+})
+
+
+_env = SandboxedEnvironment(undefined=StrictUndefined, autoescape=False)
+_env.filters["number"] = lambda v: f"{v:,.2f}" if isinstance(v, float) else f"{v:,}"
+
+
+def _template_context(sql_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the variables available to explanation templates."""
+    rows = sql_result.get("data", [])
+    columns = sql_result.get("columns", [])
+
+    totals = {}
+    for col in columns:
+        values = [
+            row[col] for row in rows
+            if isinstance(row.get(col), (int, float, Decimal)) and not isinstance(row.get(col), bool)
+        ]
+        if values:
+            totals[col] = sum(values)
+
+    return {
+        "rows": rows,
+        "columns": columns,
+        "row_count": sql_result.get("row_count", len(rows)),
+        "top_row": rows[0] if rows else {},
+        "totals": totals,
+    }
+
+
+def render_explanation(template: Dict[str, Any], sql_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fill an explanation template with query results.
+
+    Args:
+        template: Dict of explanation fields holding Jinja2 template strings
+        sql_result: Executed query result (data, columns, row_count)
+
+    Returns:
+        Explanation dict with the same fields, placeholders filled
+
+    Raises:
+        jinja2.TemplateError: If a template is invalid or references an unknown field
+        ValueError: If the number filter is applied to a non-numeric value
+    """
+    context = _template_context(sql_result)
+
+    def render(value: Any) -> Any:
+        if isinstance(value, str):
+            return _env.from_string(value).render(context)
+        if isinstance(value, list):
+            return [render(v) for v in value]
+        return value
+
+    return {field: render(template.get(field, [] if field != "summary" else "")) for field in EXPLANATION_FIELDS}
+
+
+def _add_usage(*usages: Dict[str, int]) -> Dict[str, int]:
+    """Sum token usage dicts key by key."""
+    total: Dict[str, int] = {}
+    for usage in usages:
+        for key, value in usage.items():
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def _run_separately(
+    state: Dict[str, Any],
+    context: Tuple[str, Dict[str, Any], Dict[str, Any], str],
+    usage: Dict[str, int]
+) -> Dict[str, Any]:
+    """
+    Fallback: run the SQL, Data Quality, and Explanation agents in turn.
+
+    Args:
+        state: Current state
+        context: gather_context() output already collected for the fused call
+        usage: Token usage of the failed fused call, added to the SQL tokens
+    """
+    result = sql_agent.run_with_context(state, *context)
+    result["_sql_tokens"] = _add_usage(usage, result.get("_sql_tokens", {}))
+    merged = {**state, **result}
+
+    if result.get("sql_result") and not result.get("errors"):
+        result.update(data_quality_agent.run(merged))
+        result.update(explanation_agent.run({**merged, **result}))
+
+    result["fused"] = False
+    return result
+
+
+def run(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Execute SQL generation and explanation with one LLM call.
+
+    Args:
+        state: Current state with definition_result and/or user_question
+
+    Returns:
+        dict with sql_query, sql_result, sql_explanation, quality_result,
+        explanation, and fused (False when the separate agents were used)
+    """
+    definition = state.get("definition_result", {})
+    question = state.get("user_question", "")
+
+    context = sql_agent.gather_context(question, definition)
+    rag_context, rag_metadata, discovery, discovery_context = context
+    user_prompt = sql_agent.build_user_prompt(
+        question,
+        definition,
+        rag_context,
+        discovery_context,
+        response_instructions=FUSED_RESPONSE_INSTRUCTIONS
+    )
+
+    try:
+        client = get_llm_client()
+        response = client.complete(
+            system_prompt=AgentPrompts.fused(),
+            user_prompt=user_prompt,
+            prompt_cache_key="fused_agent",
+            response_format=FUSED_RESPONSE_FORMAT,
+            cache=False
+        )
+    except Exception:
+        return _run_separately(state, context, {})
+
+    parsed = response.to_json()
+    if not parsed or "sql" not in parsed or not isinstance(parsed.get("explanation_template"), dict):
+        return _run_separately(state, context, response.usage)
+
+    sql, query_result, error = sql_agent.validate_and_execute(parsed["sql"])
+    if error:
+        return _run_separately(state, context, response.usage)
+
+    sql_result = {
+        "data": query_result.data,
+        "columns": query_result.columns,
+        "row_count": query_result.row_count
+    }
+    result = {
+        "sql_query": sql,
+        "sql_result": sql_result,
+        "sql_explanation": parsed.get("explanation", ""),
+        "privacy_check": parsed.get("privacy_check", ""),
+        "value_discovery": discovery,
+        "_sql_tokens": response.usage,
+        "_rag_metadata": rag_metadata,
+    }
+
+    result.update(data_quality_agent.run({**state, **result}))
+
+    if not sql_result["data"]:
+        # No rows to describe: use the standard no-data/privacy explanation
+        result.update(explanation_agent.run({**state, **result}))
+    else:
+        try:
+            explanation = render_explanation(parsed["explanation_template"], sql_result)
+        except (TemplateError, TypeError, ValueError):
+            explanation = explanation_agent.run({**state, **result})["explanation"]
+        else:
+            explanation["_tokens"] = {}
+        result["explanation"] = explanation
+
+    # Cache only responses whose SQL executed (see sql_agent.generate_sql)
+    client.cache_response(response)
+    result["fused"] = True
+    return result
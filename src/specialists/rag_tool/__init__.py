@@ -1,4 +1,4 @@
 # RAG Tool (Optional)
-from .retriever import retrieve
+from .retriever import retrieve, retrieve_many
 
-__all__ = ["retrieve"]
+__all__ = ["retrieve", "retrieve_many"]
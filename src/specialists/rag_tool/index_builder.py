@@ -1,12 +1,115 @@
 """
-Index Builder: Build retrieval index from schema and docs.
+Index Builder: Build retrieval indexes from the schema.
 
-Note: This is a lightweight implementation for Phase 1.
-Full vector search will be implemented in Phase 3.
+Each schema column becomes one document. Two indexes rank them:
+- BM25Index: keyword scoring from a precomputed BM25 weight matrix
+- EmbeddingIndex: exact cosine search over L2-normalized embeddings
+  (built with one batched embedding call)
 """
 
-from typing import List, Dict
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple
 import json
+import re
+
+import numpy as np
+
+
+# Identifier-like tokens (column names such as event_amount stay whole)
+TOKEN_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]+")
+
+# BM25 parameters (standard Okapi defaults)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into identifier-like tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+@dataclass
+class BM25Index:
+    """
+    BM25 (Okapi) keyword index over schema documents.
+    
+    Per-term BM25 weights are precomputed into a (documents x vocabulary)
+    matrix, so scoring a query is one column gather and row sum.
+    """
+    documents: List[Dict]
+    vocabulary: Dict[str, int]
+    weights: np.ndarray
+    
+    @classmethod
+    def from_documents(cls, documents: List[Dict]) -> "BM25Index":
+        """Tokenize document content and precompute BM25 weights."""
+        term_freqs = [Counter(tokenize(doc["content"])) for doc in documents]
+        vocabulary: Dict[str, int] = {}
+        for tf in term_freqs:
+            for term in tf:
+                vocabulary.setdefault(term, len(vocabulary))
+        
+        tf_matrix = np.zeros((len(documents), len(vocabulary)), dtype=np.float64)
+        for row, tf in enumerate(term_freqs):
+            for term, freq in tf.items():
+                tf_matrix[row, vocabulary[term]] = freq
+        
+        if not documents or not vocabulary:
+            return cls(documents, vocabulary, tf_matrix)
+        
+        n = len(documents)
+        doc_freq = np.count_nonzero(tf_matrix, axis=0)
+        idf = np.log1p((n - doc_freq + 0.5) / (doc_freq + 0.5))
+        
+        doc_lengths = tf_matrix.sum(axis=1, keepdims=True)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / doc_lengths.mean())
+        weights = idf * tf_matrix * (BM25_K1 + 1) / (tf_matrix + norm)
+        
+        return cls(documents, vocabulary, weights)
+    
+    def scores(self, tokens: List[str]) -> np.ndarray:
+        """BM25 score of every document for the query tokens."""
+        term_ids = sorted({self.vocabulary[t] for t in tokens if t in self.vocabulary})
+        if not term_ids:
+            return np.zeros(len(self.documents))
+        return self.weights[:, term_ids].sum(axis=1)
+
+
+@dataclass
+class EmbeddingIndex:
+    """Dense index: one L2-normalized float32 row per document."""
+    documents: List[Dict]
+    vectors: np.ndarray
+    
+    def search(self, queries: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact cosine search for a batch of normalized query vectors.
+        
+        Args:
+            queries: (n_queries, dim) float32 array, L2-normalized
+            top_k: Number of results per query
+            
+        Returns:
+            (scores, indices), each of shape (n_queries, k), best first
+        """
+        k = min(top_k, len(self.documents))
+        scores = queries @ self.vectors.T
+        if k < scores.shape[1]:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return np.take_along_axis(top_scores, order, axis=1), np.take_along_axis(top, order, axis=1)
+
+
+def normalize_rows(vectors: List[List[float]]) -> np.ndarray:
+    """Convert embeddings to a float32 matrix with unit-length rows."""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
 
 
 def build_index(schema_path: str = "src/config/schema.json") -> List[Dict]:
@@ -19,26 +122,23 @@ def build_index(schema_path: str = "src/config/schema.json") -> List[Dict]:
     Returns:
         List of indexed documents
     """
-    
-    # TODO: Implement index building
-    # 1. Load schema.json
-    # 2. Create searchable documents
-    # 3. Optionally compute embeddings (Phase 3)
-    
     documents = []
     
     try:
         with open(schema_path, "r") as f:
             schema = json.load(f)
             
-        # Index each column as a document
-        for column in schema.get("columns", []):
-            documents.append({
+        # Index each column as a document (metadata references the parsed
+        # column dict directly; no copy)
+        documents = [
+            {
                 "id": column["name"],
                 "type": "column",
-                "content": f"{column['name']}: {column.get('description', '')}",
+                "content": f"{column['name']}: {column.get('description') or ''}",
                 "metadata": column
-            })
+            }
+            for column in schema.get("columns", [])
+        ]
             
     except FileNotFoundError:
         print(f"Schema file not found: {schema_path}")
@@ -46,6 +146,44 @@ def build_index(schema_path: str = "src/config/schema.json") -> List[Dict]:
     return documents
 
 
+def build_bm25_index(schema_path: str = "src/config/schema.json") -> BM25Index:
+    """
+    Build a BM25 keyword index over the schema documents.
+    
+    Args:
+        schema_path: Path to schema.json
+        
+    Returns:
+        BM25Index ready for scoring queries
+    """
+    return BM25Index.from_documents(build_index(schema_path))
+
+
+def build_embedding_index(
+    schema_path: str = "src/config/schema.json",
+    documents: Optional[List[Dict]] = None
+) -> EmbeddingIndex:
+    """
+    Embed all schema documents in one batched call.
+    
+    Args:
+        schema_path: Path to schema.json
+        documents: Already-built documents (skips re-reading the schema)
+        
+    Returns:
+        EmbeddingIndex for vectorized similarity search
+    """
+    from src.rag.embedder import embed_texts
+    
+    if documents is None:
+        documents = build_index(schema_path)
+    if not documents:
+        return EmbeddingIndex(documents, np.empty((0, 0), dtype=np.float32))
+    
+    vectors = normalize_rows(embed_texts([doc["content"] for doc in documents]))
+    return EmbeddingIndex(documents, vectors)
+
+
 if __name__ == "__main__":
     docs = build_index()
     print(f"Indexed {len(docs)} documents")
@@ -5,39 +5,137 @@ Responsibilities:
 - Retrieve relevant schema information
 - Fetch metric definitions
 - Provide context for ambiguous terms
+
+Uses a BM25 keyword index over schema columns so only relevant
+columns are injected into prompts. Set RAG_TOOL_EMBEDDINGS=1 to rank
+by embedding similarity instead (falls back to BM25 on any error).
 """
 
+import os
+from functools import lru_cache
 from typing import List, Optional
 
+import numpy as np
+
+from .index_builder import (
+    BM25Index,
+    EmbeddingIndex,
+    build_embedding_index,
+    build_index,
+    normalize_rows,
+    tokenize,
+)
+
+
+DEFAULT_SCHEMA_PATH = "src/config/schema.json"
+
+# Rank with embeddings instead of BM25
+USE_EMBEDDINGS = os.getenv("RAG_TOOL_EMBEDDINGS", "false").lower() in ("1", "true")
+
+
+def _schema_mtime(schema_path: str) -> float:
+    """Modification time of schema.json (0 if missing)."""
+    try:
+        return os.path.getmtime(schema_path)
+    except OSError:
+        return 0.0
+
+
+@lru_cache(maxsize=4)
+def _load_documents(schema_path: str, mtime: float) -> List[dict]:
+    """Parse the schema once per version; shared by both indexes."""
+    return build_index(schema_path)
+
 
-def retrieve(query: str, top_k: int = 3) -> List[dict]:
+@lru_cache(maxsize=4)
+def _load_index(schema_path: str, mtime: float) -> BM25Index:
+    """Build the index once per schema version (mtime is part of the cache key)."""
+    return BM25Index.from_documents(_load_documents(schema_path, mtime))
+
+
+@lru_cache(maxsize=4)
+def _load_embedding_index(schema_path: str, mtime: float) -> EmbeddingIndex:
+    """Embed the schema once per schema version (mtime is part of the cache key)."""
+    return build_embedding_index(schema_path, documents=_load_documents(schema_path, mtime))
+
+
+def _get_index(schema_path: str) -> BM25Index:
+    """Get the cached index, rebuilding it if schema.json changed."""
+    return _load_index(schema_path, _schema_mtime(schema_path))
+
+
+def _bm25_retrieve(query: str, top_k: int, schema_path: str) -> List[dict]:
+    """Rank schema documents by BM25 score."""
+    index = _get_index(schema_path)
+    tokens = tokenize(query or "")
+    
+    # No usable query: return the first documents unranked
+    if not tokens:
+        return [{**doc, "relevance": 0.0} for doc in index.documents[:top_k]]
+    
+    scores = index.scores(tokens)
+    ranked = np.argsort(-scores, kind="stable")[:top_k]
+    best = float(scores[ranked[0]]) if len(ranked) else 0.0
+    
+    return [
+        {**index.documents[i], "relevance": round(float(scores[i]) / best, 4) if best else 0.0}
+        for i in ranked
+        if scores[i] > 0
+    ]
+
+
+def retrieve_many(queries: List[str], top_k: int = 3, schema_path: str = DEFAULT_SCHEMA_PATH) -> List[List[dict]]:
     """
-    Retrieve relevant context for a query.
+    Retrieve context for several queries with one embedding call and one
+    matrix multiply.
     
     Args:
-        query: Search query (user question or term)
-        top_k: Number of results to return
+        queries: Search queries
+        top_k: Number of results per query
+        schema_path: Path to schema.json
         
     Returns:
-        List of relevant documents/context
+        One result list per query, relevance = cosine similarity
     """
+    from src.rag.embedder import embed_texts
+    
+    index = _load_embedding_index(schema_path, _schema_mtime(schema_path))
+    if not queries or not index.documents:
+        return [[] for _ in queries]
     
-    # TODO: Implement retrieval
-    # Options:
-    # 1. Simple keyword search in schema.json
-    # 2. Vector similarity search (Phase 3)
-    # 3. Hybrid approach
+    scores, indices = index.search(normalize_rows(embed_texts(queries)), top_k)
     
-    # Placeholder - return schema info
     return [
-        {
-            "type": "schema",
-            "content": "sample_events table contains banking transaction events",
-            "relevance": 0.9
-        }
+        [
+            {**index.documents[i], "relevance": round(float(score), 4)}
+            for score, i in zip(row_scores, row_indices)
+        ]
+        for row_scores, row_indices in zip(scores, indices)
     ]
 
 
+def retrieve(query: str, top_k: int = 3, schema_path: str = DEFAULT_SCHEMA_PATH) -> List[dict]:
+    """
+    Retrieve relevant context for a query.
+    
+    Args:
+        query: Search query (user question or term)
+        top_k: Number of results to return
+        schema_path: Path to schema.json
+        
+    Returns:
+        List of relevant documents/context, each with a relevance in [0, 1]
+        (BM25 score normalized by the best match, or cosine similarity)
+    """
+    if USE_EMBEDDINGS and query:
+        try:
+            return retrieve_many([query], top_k, schema_path)[0]
+        except Exception:
+            pass
+    
+    return _bm25_retrieve(query, top_k, schema_path)
+
+
 def get_schema_context() -> str:
     """Return schema information as context string."""
     
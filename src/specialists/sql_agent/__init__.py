@@ -1,4 +1,4 @@
 # SQL Agent
-from .agent import run
+from .agent import run, run_async, run_many_async
 
-__all__ = ["run"]
+__all__ = ["run", "run_async", "run_many_async"]
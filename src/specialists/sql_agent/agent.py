@@ -12,101 +12,351 @@ Responsibilities:
 - Return structured results
 """
 
+import os
+import re
 import json
-from typing import Dict, Any, List, Optional
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, Iterable, List, Optional, Tuple
 from pathlib import Path
 
-from src.config.llm import get_llm_client
+import orjson
+
+from src.config.settings import settings
+from src.config.llm import get_llm_client, gather_limited, json_schema_format, LLMResponse
 from src.config.prompts import AgentPrompts, get_privacy_rules
-from src.tools.duckdb_tool import execute_query
-from src.tools.schema_tool import load_schema
-from src.guardrails.sql_guard import validate_sql, add_limit_if_missing
+from src.tools.duckdb_tool import execute_query, execute_query_scalar, check_query, single_select_error, get_data_signature, QueryResult
+from src.tools.schema_tool import load_schema, get_column_set
+from src.guardrails.sql_guard import validate_sql, add_limit_if_missing, SQLValidationResult
 from src.rag import get_retriever
+from src.specialists import _semantic_cache
 
 
 # Columns that benefit from value discovery
-DISCOVERABLE_COLUMNS = [
+DISCOVERABLE_COLUMNS: FrozenSet[str] = frozenset({
     "event_type", "event_name", "channel", "product_type", "currency"
-]
+})
 
 # Discovery constraints
 DISCOVERY_LIMIT = 50
 DISCOVERY_TIME_WINDOW_DAYS = 90
 
+# Sidecar (next to the data file) holding the default-window discovery
+DISCOVERY_SNAPSHOT_SUFFIX = ".discovery.json"
+
+# Discovery must project only the columns it needs (checked in debug runs)
+_SELECT_STAR = re.compile(r"SELECT\s+\*", re.IGNORECASE)
+
+
+def _exact_values_sql(columns: List[str]) -> str:
+    """Exact top-N values per column (GROUP BY + QUALIFY), one row per value."""
+    per_column = "\n                UNION ALL\n".join(
+        f"""                SELECT '{col}' AS col, {col}::VARCHAR AS value, COUNT(*) AS cnt
+                FROM recent WHERE {col} IS NOT NULL GROUP BY {col}"""
+        for col in columns
+    )
+    return f"""
+            WITH recent AS (
+                SELECT {", ".join(columns)} FROM events WHERE event_date >= ?
+            ),
+            counts AS (
+{per_column}
+            )
+            SELECT col, value FROM counts
+            QUALIFY row_number() OVER (PARTITION BY col ORDER BY cnt DESC, value) <= {DISCOVERY_LIMIT}
+            ORDER BY col, cnt DESC, value
+        """
+
+
+def _approx_values_sql(columns: List[str]) -> str:
+    """Approximate top-N values (approx_top_k), one list column per column."""
+    sketches = ", ".join(
+        f"approx_top_k({col}, {DISCOVERY_LIMIT}) AS {col}" for col in columns
+    )
+    return f"""
+            SELECT {sketches}
+            FROM events WHERE event_date >= ?
+        """
+
+
+class _DiscoveryFailed(Exception):
+    """Discovery query failed (raised so lru_cache does not store the miss)."""
+
 
-def discover_column_values(columns: List[str], time_window_days: int = DISCOVERY_TIME_WINDOW_DAYS) -> Dict[str, List[str]]:
+def discover_data_context(
+    columns: Iterable[str],
+    time_window_days: int = DISCOVERY_TIME_WINDOW_DAYS,
+    use_approx: bool = True
+) -> Dict[str, Any]:
     """
-    Discover actual values for categorical columns.
+    Discover the date range and categorical values (see _run_discovery).
     
-    Performs limited SELECT DISTINCT queries to find real values in the data.
-    Uses time windows and limits for safety.
+    Results are cached per (columns, time window, mode, data file version),
+    so repeated questions skip the query entirely.
     
     Args:
-        columns: List of column names to discover values for
-        time_window_days: Restrict discovery to recent N days
+        columns: Column names to discover values for (non-discoverable
+            columns are ignored)
+        time_window_days: Restrict value discovery to recent N days
+        use_approx: Use approx_top_k instead of exact GROUP BY counts
         
     Returns:
-        Dict mapping column names to lists of discovered values
+        Dict with date_range (min_date, max_date, num_days) and
+        column_values (column -> list of values, most frequent first)
     """
-    discovered = {}
+    # Sorted so the cache key (and query) does not depend on set order
+    columns_key = tuple(sorted(DISCOVERABLE_COLUMNS.intersection(columns)))
     
-    for col in columns:
-        if col not in DISCOVERABLE_COLUMNS:
-            continue
-            
-        try:
-            # Build discovery query with time window and limit
-            sql = f"""
-                SELECT DISTINCT {col} as value, COUNT(*) as cnt
-                FROM events
-                WHERE {col} IS NOT NULL
-                  AND event_date >= (SELECT MAX(event_date) - INTERVAL '{time_window_days} days' FROM events)
-                GROUP BY {col}
-                ORDER BY cnt DESC
-                LIMIT {DISCOVERY_LIMIT}
-            """
-            
-            result = execute_query(sql)
-            
-            if result.success and result.data:
-                discovered[col] = [row["value"] for row in result.data]
-            
-        except Exception as e:
-            # Discovery is optional, don't fail the whole query
-            discovered[col] = []
-    
-    return discovered
+    try:
+        date_range, column_values = _cached_discovery(
+            columns_key, time_window_days, use_approx, get_data_signature()
+        )
+    except _DiscoveryFailed:
+        # Discovery is optional, don't fail the whole query
+        return {
+            "date_range": {"min_date": "", "max_date": "", "num_days": 0},
+            "column_values": {}
+        }
+    
+    # Fresh containers per call; the cached tuples stay immutable
+    return {
+        "date_range": dict(date_range),
+        "column_values": {col: list(values) for col, values in column_values}
+    }
 
 
-def discover_date_range() -> Dict[str, str]:
+def discovery_cache_stats() -> Dict[str, int]:
+    """Hit/miss counters for the discovery cache."""
+    info = _cached_discovery.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
+
+
+@lru_cache(maxsize=256)
+def _cached_discovery(
+    columns: Tuple[str, ...],
+    time_window_days: int,
+    use_approx: bool,
+    data_signature: str
+) -> Tuple[Tuple[Tuple[str, Any], ...], Tuple[Tuple[str, Tuple[str, ...]], ...]]:
     """
-    Discover the actual date range in the data.
+    Run the fused discovery query (data_signature only keys the cache).
     
     Returns:
-        Dict with min_date and max_date
+        Tuple of (date_range items, (column, values) pairs)
+    """
+    context = _run_discovery(list(columns), time_window_days, use_approx, data_signature)
+    return (
+        tuple(context["date_range"].items()),
+        tuple((col, tuple(values)) for col, values in context["column_values"].items())
+    )
+
+
+@lru_cache(maxsize=4)
+def _date_stats(data_signature: str) -> Tuple[Any, Any, int]:
+    """
+    Overall date range of the data (data_signature only keys the cache).
+    
+    Cached per data file version, so value discovery can filter on a
+    concrete cutoff date instead of recomputing MAX(event_date) per query.
+    
+    Returns:
+        Tuple of (min_date, max_date, num_days)
+    
+    Raises:
+        _DiscoveryFailed: If the query fails
     """
     try:
-        sql = """
+        row = execute_query_scalar("""
             SELECT 
                 MIN(event_date) as min_date,
                 MAX(event_date) as max_date,
                 COUNT(DISTINCT event_date) as num_days
             FROM events
-        """
-        
-        result = execute_query(sql)
-        
-        if result.success and result.data:
-            row = result.data[0]
+        """)
+    except RuntimeError as e:
+        raise _DiscoveryFailed(str(e)) from e
+    
+    if row is None:
+        raise _DiscoveryFailed("no rows")
+    return row
+
+
+def _run_discovery(
+    columns: List[str],
+    time_window_days: int,
+    use_approx: bool,
+    data_signature: str
+) -> Dict[str, Any]:
+    """
+    Discover the date range and categorical values.
+    
+    Requests for the default time window are served from the on-disk
+    snapshot (exact values for every discoverable column); anything else
+    queries DuckDB.
+    
+    Raises:
+        _DiscoveryFailed: If a query fails
+    """
+    if time_window_days == DISCOVERY_TIME_WINDOW_DAYS:
+        try:
+            snapshot = _discovery_snapshot(data_signature)
+        except _DiscoveryFailed:
+            pass  # not memoized: the next call retries the snapshot
+        else:
+            column_values = snapshot["column_values"]
             return {
-                "min_date": str(row.get("min_date", "")),
-                "max_date": str(row.get("max_date", "")),
-                "num_days": row.get("num_days", 0)
+                "column_values": {col: list(column_values[col]) for col in columns if column_values.get(col)},
+                "date_range": dict(snapshot["date_range"])
             }
-    except Exception:
+    
+    return _query_discovery(columns, time_window_days, use_approx, data_signature)
+
+
+def _snapshot_path() -> str:
+    """Sidecar file next to the data file (e.g. data/sample_events.discovery.json)."""
+    data_path = settings.get_absolute_path(settings.data_path)
+    return os.path.splitext(str(data_path))[0] + DISCOVERY_SNAPSHOT_SUFFIX
+
+
+@lru_cache(maxsize=4)
+def _discovery_snapshot(data_signature: str) -> Dict[str, Any]:
+    """
+    Default-window discovery for all discoverable columns, persisted on disk.
+    
+    Values are static between data refreshes, so the snapshot is read from
+    the sidecar JSON when its stored data signature matches; otherwise it
+    is recomputed with one exact query and rewritten.
+    
+    Returns:
+        Dict with signature, date_range, and column_values
+        
+    Raises:
+        _DiscoveryFailed: If the discovery query fails (raised rather than
+            returned so lru_cache never memoizes a failure)
+    """
+    path = _snapshot_path()
+    try:
+        with open(path, "rb") as f:
+            snapshot = orjson.loads(f.read())
+        # A sidecar missing a field (older or hand-edited) counts as a miss
+        if (
+            snapshot.get("signature") == data_signature
+            and isinstance(snapshot.get("column_values"), dict)
+            and isinstance(snapshot.get("date_range"), dict)
+        ):
+            return snapshot
+    except (OSError, orjson.JSONDecodeError, AttributeError):
         pass
     
-    return {"min_date": "", "max_date": "", "num_days": 0}
+    context = _query_discovery(
+        sorted(DISCOVERABLE_COLUMNS), DISCOVERY_TIME_WINDOW_DAYS, False, data_signature
+    )
+    snapshot = {"signature": data_signature, **context}
+    
+    # Write to a temp file and rename so readers never see a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(snapshot))
+        os.replace(tmp_path, path)
+    except OSError:
+        # Read-only data directory or full disk: keep the in-memory snapshot
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+    
+    return snapshot
+
+
+def _query_discovery(
+    columns: List[str],
+    time_window_days: int,
+    use_approx: bool,
+    data_signature: str
+) -> Dict[str, Any]:
+    """
+    Discover the date range and categorical values with DuckDB.
+    
+    The date range comes from _date_stats (one aggregate per data version).
+    Values are then read with a single query filtered on the concrete
+    cutoff date (max_date - time_window_days), which DuckDB can push down
+    into the Parquet scan. For each column it returns the most frequent
+    values (top DISCOVERY_LIMIT). Approximate mode uses DuckDB's
+    approx_top_k sketch, which needs O(DISCOVERY_LIMIT) memory per column
+    and no sort; exact mode groups and ranks every distinct value (ties
+    broken by value).
+    
+    Raises:
+        _DiscoveryFailed: If a query fails
+    """
+    min_date, max_date, num_days = _date_stats(data_signature)
+    
+    context = {
+        "column_values": {},
+        "date_range": {
+            "min_date": str(min_date),
+            "max_date": str(max_date),
+            "num_days": num_days
+        }
+    }
+    
+    if not columns or max_date is None:
+        return context
+    
+    # Column names are identifiers and stay in the SQL text; the cutoff is bound
+    cutoff = max_date - timedelta(days=time_window_days)
+    sql = (_approx_values_sql if use_approx else _exact_values_sql)(columns)
+    assert not _SELECT_STAR.search(sql), "discovery SQL must not use SELECT *"
+    result = execute_query(sql, params=[cutoff])
+    if not result.success:
+        raise _DiscoveryFailed(result.error)
+    
+    if use_approx:
+        first = result.data[0] if result.data else {}
+        for col in columns:
+            if first.get(col):
+                context["column_values"][col] = [str(v) for v in first[col]]
+    else:
+        for row in result.data:
+            context["column_values"].setdefault(row["col"], []).append(row["value"])
+    
+    return context
+
+
+def discover_column_values(
+    columns: Iterable[str],
+    time_window_days: int = DISCOVERY_TIME_WINDOW_DAYS,
+    use_approx: bool = True
+) -> Dict[str, List[str]]:
+    """
+    Discover actual values for categorical columns.
+    
+    Uses time windows and limits for safety (see discover_data_context).
+    
+    Args:
+        columns: Column names to discover values for (list, set, or frozenset)
+        time_window_days: Restrict discovery to recent N days
+        use_approx: Use approx_top_k instead of exact counts
+        
+    Returns:
+        Dict mapping column names to lists of discovered values
+    """
+    return discover_data_context(columns, time_window_days, use_approx)["column_values"]
+
+
+def discover_date_range() -> Dict[str, str]:
+    """
+    Discover the actual date range in the data.
+    
+    Returns:
+        Dict with min_date and max_date
+    """
+    return discover_data_context([])["date_range"]
 
 
 def discover_values_for_definition(definition: Dict[str, Any]) -> Dict[str, Any]:
@@ -127,51 +377,41 @@ def discover_values_for_definition(definition: Dict[str, Any]) -> Dict[str, Any]
         "discovery_notes": []
     }
     
-    # 1. Discover date range
-    discovery_result["date_range"] = discover_date_range()
-    
-    # 2. Identify columns that need value discovery
-    columns_to_discover = set()
-    
+    # 1. Identify columns that need value discovery
     # From dimensions
-    dimensions = definition.get("dimensions", [])
-    for dim in dimensions:
-        if dim in DISCOVERABLE_COLUMNS:
-            columns_to_discover.add(dim)
+    columns_to_discover = set(definition.get("dimensions", [])) & DISCOVERABLE_COLUMNS
     
     # From filters (can be dict {"column": "condition"} or list of strings/dicts)
     filters = definition.get("filters", [])
     if isinstance(filters, dict):
         # Format: {"column_name": "condition"}
-        for col in filters.keys():
-            if col in DISCOVERABLE_COLUMNS:
-                columns_to_discover.add(col)
+        filter_columns = list(filters)
     elif isinstance(filters, list):
-        for f in filters:
-            if isinstance(f, str):
-                # Format: ["column_name", ...] or ["column_name = value", ...]
-                col = f.split()[0].strip("'\"")
-                if col in DISCOVERABLE_COLUMNS:
-                    columns_to_discover.add(col)
-            elif isinstance(f, dict):
-                # Format: [{"column": "col_name", ...}, ...]
-                col = f.get("column", "")
-                if col in DISCOVERABLE_COLUMNS:
-                    columns_to_discover.add(col)
+        filter_columns = [
+            # Format: ["column_name", ...] or ["column_name = value", ...]
+            f.split()[0].strip("'\"") if isinstance(f, str)
+            # Format: [{"column": "col_name", ...}, ...]
+            else f.get("column", "")
+            for f in filters
+            if isinstance(f, (str, dict))
+        ]
+    else:
+        filter_columns = []
+    columns_to_discover |= DISCOVERABLE_COLUMNS.intersection(filter_columns)
     
     # Always discover event_type and event_name if not already specified
-    if "event_type" not in columns_to_discover:
-        columns_to_discover.add("event_type")
+    columns_to_discover.add("event_type")
     
-    # 3. Perform discovery
-    if columns_to_discover:
-        discovery_result["column_values"] = discover_column_values(list(columns_to_discover))
-        
-        for col, values in discovery_result["column_values"].items():
-            if values:
-                discovery_result["discovery_notes"].append(
-                    f"Found {len(values)} distinct values for '{col}': {values[:5]}{'...' if len(values) > 5 else ''}"
-                )
+    # 2. Discover date range and values in one query
+    context = discover_data_context(columns_to_discover)
+    discovery_result["date_range"] = context["date_range"]
+    discovery_result["column_values"] = context["column_values"]
+    
+    for col, values in discovery_result["column_values"].items():
+        if values:
+            discovery_result["discovery_notes"].append(
+                f"Found {len(values)} distinct values for '{col}': {values[:5]}{'...' if len(values) > 5 else ''}"
+            )
     
     return discovery_result
 
@@ -214,77 +454,101 @@ def format_discovery_context(discovery: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-def run(state: Dict[str, Any]) -> Dict[str, Any]:
+# Output instructions appended to the SQL generation prompt
+SQL_RESPONSE_INSTRUCTIONS = "Return your SQL query as JSON with: sql, explanation, privacy_check"
+
+# Output schema (matches prompts/agents/sql.md) enforced via Structured Outputs
+SQL_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "sql": {"type": "string"},
+        "explanation": {"type": "string"},
+        "privacy_check": {"type": "string"},
+        "estimated_rows": {"type": "string"}
+    },
+    "required": ["sql", "explanation", "privacy_check", "estimated_rows"],
+    "additionalProperties": False
+}
+SQL_RESPONSE_FORMAT = json_schema_format("sql_response", SQL_RESPONSE_SCHEMA)
+
+
+def _retrieve_rag(question: str) -> Tuple[str, Dict[str, Any]]:
     """
-    Execute the SQL Agent with RAG-augmented context.
+    Retrieve knowledge/schema context for SQL generation.
     
-    Steps:
-    1. RAG Retrieval - Get relevant SQL patterns and metrics
-    2. Value Discovery - Find actual values in the data
-    3. Query Generation - Generate SQL using discovered context
-    4. Validation - Validate SQL against guardrails
-    5. Execution - Run query via DuckDB
+    Paraphrased questions reuse an earlier retrieval via the semantic cache.
+    
+    Returns:
+        Tuple of (rag_context, rag_metadata)
+    """
+    cached = _semantic_cache.lookup(question, "rag_sql")
+    if cached is not None:
+        return cached["context"], cached["metadata"]
+    
+    retriever = get_retriever()
+    rag_result = retriever.retrieve_for_sql(question)
+    rag_context = rag_result.get_context_string(max_chunks=6)
+    rag_metadata = rag_result.get_metadata_summary()
+    _semantic_cache.store(question, "rag_sql", {"context": rag_context, "metadata": rag_metadata})
+    return rag_context, rag_metadata
+
+
+def _discover(definition: Dict[str, Any]) -> Dict[str, Any]:
+    """Discover actual data values relevant to the definition."""
+    if definition and not definition.get("error"):
+        return discover_values_for_definition(definition)
+    
+    # Basic discovery even without definition
+    return {
+        "date_range": discover_date_range(),
+        "column_values": discover_column_values(["event_type", "event_name", "channel"])
+    }
+
+
+def gather_context(
+    question: str,
+    definition: Dict[str, Any]
+) -> Tuple[str, Dict[str, Any], Dict[str, Any], str]:
+    """
+    Collect RAG context and discovered data values for SQL generation.
+    
+    RAG retrieval (network bound) and value discovery (DuckDB) are
+    independent, so they run concurrently; a failure in one does not
+    affect the other.
     
     Args:
-        state: Current state with definition_result and/or user_question
+        question: User question
+        definition: The definition from Definition Agent (may be empty)
         
     Returns:
-        dict with sql_query, sql_result, and sql_explanation
+        Tuple of (rag_context, rag_metadata, discovery, discovery_context)
     """
-    definition = state.get("definition_result", {})
-    question = state.get("user_question", "")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        rag_future = executor.submit(_retrieve_rag, question)
+        discovery_future = executor.submit(_discover, definition)
     
-    # --- Step 0: RAG Retrieval ---
-    rag_context = ""
-    rag_metadata = {}
     try:
-        retriever = get_retriever()
-        rag_result = retriever.retrieve_for_sql(question)
-        rag_context = rag_result.get_context_string(max_chunks=6)
-        rag_metadata = rag_result.get_metadata_summary()
+        rag_context, rag_metadata = rag_future.result()
     except Exception as e:
         rag_context = ""
         rag_metadata = {"error": str(e)}
     
-    # --- Step 1: Value Discovery ---
-    discovery = {}
-    discovery_context = ""
-    
-    if definition and not definition.get("error"):
-        discovery = discover_values_for_definition(definition)
-        discovery_context = format_discovery_context(discovery)
-    else:
-        # Basic discovery even without definition
-        discovery = {
-            "date_range": discover_date_range(),
-            "column_values": discover_column_values(["event_type", "event_name", "channel"])
-        }
-        discovery_context = format_discovery_context(discovery)
-    
-    # --- Step 2: Query Generation ---
-    
-    # Get composed prompt (system + schema + SQL safety guardrail + agent-specific)
-    system_prompt = AgentPrompts.sql()
-    
-    # Get privacy rules
-    privacy_rules = get_privacy_rules()
+    try:
+        discovery = discovery_future.result()
+    except Exception as e:
+        discovery = {"error": str(e)}
+    discovery_context = format_discovery_context(discovery)
     
-    # Build user prompt with RAG and discovery context
-    if definition and not definition.get("error"):
-        user_prompt = f"""Generate a privacy-safe SQL query for this analytical definition.
-
-{rag_context}
-
-{discovery_context}
+    return rag_context, rag_metadata, discovery, discovery_context
 
-**Definition:**
-```json
-{json.dumps(definition, indent=2)}
-```
 
-**Original question:** "{question}"
-
-**Privacy requirements:**
+@lru_cache(maxsize=2)
+def _prompt_tail(with_definition: bool) -> str:
+    """Static privacy requirements and instructions (built once per process)."""
+    privacy_rules = get_privacy_rules()
+    
+    if with_definition:
+        return f"""**Privacy requirements:**
 - k-anonymity threshold: {privacy_rules['k_anonymity_threshold']} distinct entities per bucket
 - Never include {privacy_rules['forbidden_output_columns']} in output columns
 - Max result rows: {privacy_rules['max_result_rows']}
@@ -294,40 +558,318 @@ def run(state: Dict[str, Any]) -> Dict[str, Any]:
 - Use the retrieved SQL patterns and metrics from the knowledge base
 - Use the discovered values above to ensure correct filters
 - If filtering on event_type, use one of the discovered event_type values
-- Use the actual date range available in the data, not CURRENT_DATE
+- Use the actual date range available in the data, not CURRENT_DATE"""
+    
+    return f"""**Privacy requirements:**
+- k-anonymity threshold: {privacy_rules['k_anonymity_threshold']} distinct entities per bucket
+- Never include customer_id or account_id in output columns
+- Use aggregations only
+
+**Important:**
+- Use the retrieved SQL patterns and metrics from the knowledge base
+- Use the discovered values above to ensure correct filters"""
+
 
-Return your SQL query as JSON with: sql, explanation, privacy_check"""
+def build_user_prompt(
+    question: str,
+    definition: Dict[str, Any],
+    rag_context: str,
+    discovery_context: str,
+    response_instructions: str = SQL_RESPONSE_INSTRUCTIONS
+) -> str:
+    """
+    Build the SQL generation prompt from the question and gathered context.
+    
+    Args:
+        question: User question
+        definition: The definition from Definition Agent (may be empty)
+        rag_context: Retrieved knowledge/schema context
+        discovery_context: Formatted value discovery results
+        response_instructions: Final line describing the expected JSON output
+        
+    Returns:
+        User prompt string
+    """
+    if definition and not definition.get("error"):
+        definition_json = orjson.dumps(definition, default=str).decode()
+        sections = [
+            "Generate a privacy-safe SQL query for this analytical definition.",
+            rag_context,
+            discovery_context,
+            f"**Definition:**\n```json\n{definition_json}\n```",
+            f'**Original question:** "{question}"',
+            _prompt_tail(True),
+            response_instructions,
+        ]
     else:
-        user_prompt = f"""Generate a privacy-safe SQL query to answer this question.
+        sections = [
+            "Generate a privacy-safe SQL query to answer this question.",
+            rag_context,
+            discovery_context,
+            f'**Question:** "{question}"',
+            _prompt_tail(False),
+            response_instructions,
+        ]
+    
+    return "\n\n".join(sections)
 
-{rag_context}
 
-{discovery_context}
+# Extra LLM turns allowed to fix SQL that fails to parse or bind
+MAX_SQL_REPAIR_ATTEMPTS = 1
 
-**Question:** "{question}"
 
-**Privacy requirements:**
-- k-anonymity threshold: {privacy_rules['k_anonymity_threshold']} distinct entities per bucket
-- Never include customer_id or account_id in output columns
-- Use aggregations only
+def generate_sql(
+    system_prompt: str,
+    user_prompt: str
+) -> Tuple[Optional[Dict[str, Any]], Dict[str, int], Optional[LLMResponse]]:
+    """
+    Ask the LLM for SQL, repairing it in-conversation if it fails to plan.
+    
+    The draft is checked against the guardrails, then locally with
+    check_query (parse + bind against an empty events table). On error the model gets the message as a follow-up
+    turn, which is cheaper than failing the whole request.
+    
+    Drafts are not written to the persistent LLM cache: the caller stores
+    the final response with cache_response() once the SQL has executed,
+    so a bad draft is never replayed.
+    
+    Args:
+        system_prompt: SQL Agent system prompt
+        user_prompt: Prompt built by build_user_prompt
+        
+    Returns:
+        Tuple of (parsed response or None, summed token usage, final LLM response)
+    """
+    client = get_llm_client()
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+    usage: Dict[str, int] = {}
+    response = None
+    
+    for attempt in range(MAX_SQL_REPAIR_ATTEMPTS + 1):
+        response = client.chat(
+            messages,
+            prompt_cache_key="sql_agent",
+            response_format=SQL_RESPONSE_FORMAT,
+            cache=False
+        )
+        for key, value in response.usage.items():
+            usage[key] = usage.get(key, 0) + value
+        
+        result = response.to_json()
+        if not result or not result.get("sql"):
+            return result, usage, response
+        
+        # Guardrails first: SQL they reject must never reach DuckDB, not even
+        # as EXPLAIN (validate_and_execute reports the rejection)
+        validation, _ = _guard_sql(result["sql"], _schema_columns())
+        if not validation.is_allowed:
+            return result, usage, response
+        
+        error = check_query(result["sql"])
+        if error is None or attempt == MAX_SQL_REPAIR_ATTEMPTS:
+            return result, usage, response
+        
+        messages += [
+            {"role": "assistant", "content": response.content},
+            {"role": "user", "content": f"The SQL failed to parse: {error}\nFix the query and return the corrected JSON."}
+        ]
+    
+    return result, usage, response
 
-**Important:**
-- Use the retrieved SQL patterns and metrics from the knowledge base
-- Use the discovered values above to ensure correct filters
 
-Return your SQL query as JSON with: sql, explanation, privacy_check"""
+def _schema_columns() -> FrozenSet[str]:
+    """Schema column names (empty if the schema can't load: column checks are skipped)."""
+    try:
+        return get_column_set()
+    except Exception:
+        return frozenset()
+
+
+@lru_cache(maxsize=1024)
+def _guard_sql(sql: str, schema_columns: FrozenSet[str]) -> Tuple[SQLValidationResult, str]:
+    """
+    Validate SQL and add the default LIMIT, memoized per SQL string.
+    
+    Retries often produce byte-identical SQL. schema_columns is only part of
+    the key: reload_schema() yields a new column set, so stale validations
+    are never reused. Treat the returned result as read-only.
+    
+    Returns:
+        Tuple of (validation result, SQL to execute if allowed)
+    """
+    validation = validate_sql(sql, check_columns=True)
+    if not validation.is_allowed:
+        return validation, sql
+    
+    # Add limit if missing
+    return validation, add_limit_if_missing(validation.sanitized_sql or sql, default_limit=100)
+
+
+def validate_and_execute(sql: str) -> Tuple[str, Optional[QueryResult], Optional[str]]:
+    """
+    Validate generated SQL against guardrails, then execute it.
+    
+    Args:
+        sql: SQL produced by the LLM
+        
+    Returns:
+        Tuple of (final SQL, query result, error message). On failure the
+        result is None and the error describes the failed step.
+    """
+    validation, guarded_sql = _guard_sql(sql, _schema_columns())
+    
+    if not validation.is_allowed:
+        return sql, None, f"SQL validation failed: {validation.reason}"
+    
+    sql = guarded_sql
+    
+    # DuckDB would run every statement in the string on the shared connection
+    statement_error = single_select_error(sql)
+    if statement_error:
+        return sql, None, f"SQL validation failed: {statement_error}"
+    
+    query_result = execute_query(sql)
+    
+    if not query_result.success:
+        return sql, None, f"Query execution failed: {query_result.error}"
+    
+    return sql, query_result, None
+
+
+# Runs currently executing, keyed by _inflight_key(); identical concurrent
+# requests wait on the first one instead of paying for their own LLM call
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _inflight_key(state: Dict[str, Any]) -> str:
+    """Key identifying every input run() depends on."""
+    payload = json.dumps(
+        [state.get("user_question", ""), state.get("definition_result", {}), state.get("errors", [])],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def run(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Execute the SQL Agent, coalescing identical concurrent requests.
+    
+    If a run with the same question, definition, and prior errors is
+    already in flight, wait for its result instead of starting another.
+    See _run() for the pipeline steps.
+    
+    Args:
+        state: Current state with definition_result and/or user_question
+        
+    Returns:
+        dict with sql_query, sql_result, and sql_explanation
+    """
+    key = _inflight_key(state)
+    
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+    
+    if not owner:
+        return dict(future.result())
+    
+    try:
+        result = _run(state)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _run(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Execute the SQL Agent with RAG-augmented context.
+    
+    Steps:
+    1. RAG Retrieval - Get relevant SQL patterns and metrics
+    2. Value Discovery - Find actual values in the data
+    3. Query Generation - Generate SQL using discovered context (one repair
+       turn if the draft fails to parse)
+    4. Validation - Validate SQL against guardrails
+    5. Execution - Run query via DuckDB
+    
+    Args:
+        state: Current state with definition_result and/or user_question
+        
+    Returns:
+        dict with sql_query, sql_result, and sql_explanation
+    """
+    definition = state.get("definition_result", {})
+    question = state.get("user_question", "")
+    
+    # --- Steps 0-1: RAG Retrieval + Value Discovery ---
+    context = gather_context(question, definition)
+    
+    return run_with_context(state, *context)
+
+
+def run_with_context(
+    state: Dict[str, Any],
+    rag_context: str,
+    rag_metadata: Dict[str, Any],
+    discovery: Dict[str, Any],
+    discovery_context: str
+) -> Dict[str, Any]:
+    """
+    Execute the SQL Agent from steps 2-5 with already gathered context.
+    
+    Lets callers that ran gather_context() themselves (the fused agent's
+    fallback) skip repeating RAG retrieval and value discovery.
+    
+    Args:
+        state: Current state with definition_result and/or user_question
+        rag_context, rag_metadata, discovery, discovery_context: Output of gather_context()
+        
+    Returns:
+        dict with sql_query, sql_result, and sql_explanation
+    """
+    definition = state.get("definition_result", {})
+    question = state.get("user_question", "")
+    
+    # --- Step 2: Query Generation ---
+    
+    # Get composed prompt (system + schema + SQL safety guardrail + agent-specific)
+    system_prompt = AgentPrompts.sql()
+    
+    # Build user prompt with RAG and discovery context
+    user_prompt = build_user_prompt(question, definition, rag_context, discovery_context)
+    
+    # Semantic cache: a rephrased question with the identical definition
+    # can reuse the generated SQL (it is still validated and executed below)
+    semantic_guard = ""
+    if definition and not definition.get("error"):
+        semantic_guard = hashlib.blake2b(
+            json.dumps(definition, sort_keys=True, default=str).encode(),
+            digest_size=16
+        ).hexdigest()
     
     # Call LLM
     try:
-        client = get_llm_client()
-        response = client.complete(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            json_mode=True
-        )
+        result = None
+        usage = {}
+        response = None
+        if semantic_guard:
+            result = _semantic_cache.lookup(question, "sql", guard=semantic_guard)
+        from_cache = result is not None
         
-        # Parse response
-        result = response.to_json()
+        if result is None:
+            result, usage, response = generate_sql(system_prompt, user_prompt)
         
         if result is None or "sql" not in result:
             return {
@@ -342,32 +884,23 @@ Return your SQL query as JSON with: sql, explanation, privacy_check"""
         explanation = result.get("explanation", "")
         privacy_check = result.get("privacy_check", "")
         
-        # --- Step 3: Validation ---
-        validation = validate_sql(sql, check_columns=True)
+        # --- Steps 3-4: Validation + Execution ---
+        sql, query_result, error = validate_and_execute(sql)
         
-        if not validation.is_allowed:
+        if error:
             return {
                 "sql_query": sql,
                 "sql_result": None,
                 "sql_explanation": explanation,
                 "value_discovery": discovery,
-                "errors": state.get("errors", []) + [f"SQL validation failed: {validation.reason}"]
+                "errors": state.get("errors", []) + [error]
             }
         
-        # Add limit if missing
-        sql = add_limit_if_missing(validation.sanitized_sql or sql, default_limit=100)
-        
-        # --- Step 4: Execution ---
-        query_result = execute_query(sql)
-        
-        if not query_result.success:
-            return {
-                "sql_query": sql,
-                "sql_result": None,
-                "sql_explanation": explanation,
-                "value_discovery": discovery,
-                "errors": state.get("errors", []) + [f"Query execution failed: {query_result.error}"]
-            }
+        # Only SQL that validated and executed is worth reusing
+        if response is not None:
+            get_llm_client().cache_response(response)
+        if semantic_guard and not from_cache:
+            _semantic_cache.store(question, "sql", result, guard=semantic_guard)
         
         return {
             "sql_query": sql,
@@ -379,7 +912,7 @@ Return your SQL query as JSON with: sql, explanation, privacy_check"""
             "sql_explanation": explanation,
             "privacy_check": privacy_check,
             "value_discovery": discovery,
-            "_sql_tokens": response.usage,
+            "_sql_tokens": usage,
             "_rag_metadata": rag_metadata
         }
         
@@ -393,6 +926,28 @@ Return your SQL query as JSON with: sql, explanation, privacy_check"""
         }
 
 
+async def run_async(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async version of run().
+    
+    The pipeline interleaves DuckDB discovery/execution with the LLM call,
+    so it runs in a worker thread to keep the event loop free.
+    """
+    return await asyncio.to_thread(run, state)
+
+
+async def run_many_async(states: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Run the SQL Agent for several independent states concurrently.
+    
+    At most MAX_CONCURRENT_LLM_CALLS runs are in flight at once.
+    
+    Returns:
+        List of run() outputs, in the same order as states
+    """
+    return await gather_limited(run_async(state) for state in states)
+
+
 if __name__ == "__main__":
     # Test value discovery
     print("=== Testing Value Discovery ===\n")
@@ -1,25 +1,59 @@
 # Shared Tools Package
-from .duckdb_tool import execute_query, execute_query_df, get_table_info, QueryResult
-from .schema_tool import (
-    load_schema,
-    load_knowledge,
-    get_column_names,
-    get_column_info,
-    get_metrics,
-    get_schema_context,
-    get_metrics_context,
-)
+#
+# Exports are resolved lazily (PEP 562) so importing schema helpers does
+# not load duckdb/pandas/pyarrow until a query function is first used.
+from importlib import import_module
+
+_EXPORTS = {
+    "execute_query": "duckdb_tool",
+    "execute_query_scalar": "duckdb_tool",
+    "execute_query_arrow": "duckdb_tool",
+    "execute_query_stream": "duckdb_tool",
+    "execute_query_df": "duckdb_tool",
+    "check_query": "duckdb_tool",
+    "get_table_info": "duckdb_tool",
+    "QueryResult": "duckdb_tool",
+    "load_schema": "schema_tool",
+    "load_knowledge": "schema_tool",
+    "get_column_names": "schema_tool",
+    "get_column_set": "schema_tool",
+    "get_column_info": "schema_tool",
+    "get_metrics": "schema_tool",
+    "get_schema_context": "schema_tool",
+    "get_metrics_context": "schema_tool",
+    "reload_schema": "schema_tool",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value  # resolve once; later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
+
 
 __all__ = [
     "execute_query",
+    "execute_query_scalar",
+    "execute_query_arrow",
+    "execute_query_stream",
     "execute_query_df",
+    "check_query",
     "get_table_info",
     "QueryResult",
     "load_schema",
     "load_knowledge",
     "get_column_names",
+    "get_column_set",
     "get_column_info",
     "get_metrics",
     "get_schema_context",
     "get_metrics_context",
+    "reload_schema",
 ]
@@ -4,13 +4,20 @@ DuckDB Tool: Execute SQL queries on CSV files.
 No database setup required - DuckDB reads CSV directly.
 """
 
+import os
+import threading
+
 import duckdb
-import pandas as pd
-from typing import Any, List, Dict, Optional
+from typing import TYPE_CHECKING, Any, Iterator, List, Dict, Optional, Sequence, Tuple
 from dataclasses import dataclass
 
 from src.config.settings import settings
 
+if TYPE_CHECKING:
+    # pandas/pyarrow are imported on first DataFrame/Arrow use, not at import time
+    import pandas as pd
+    import pyarrow as pa
+
 
 @dataclass
 class QueryResult:
@@ -21,40 +28,235 @@ class QueryResult:
     row_count: int
     error: Optional[str] = None
     
-    def to_df(self) -> pd.DataFrame:
+    def to_df(self) -> "pd.DataFrame":
         """Convert result to pandas DataFrame."""
+        import pandas as pd
         return pd.DataFrame(self.data)
     
     def to_markdown(self) -> str:
-        """Convert result to markdown table."""
+        """Convert result to markdown table (built directly, no pandas)."""
         if not self.data:
             return "_No results_"
         
-        df = self.to_df()
-        return df.to_markdown(index=False)
+        def cell(value: Any) -> str:
+            return str(value).replace("|", "\\|")
+        
+        lines = [
+            "| " + " | ".join(cell(col) for col in self.columns) + " |",
+            "|" + "---|" * len(self.columns),
+        ]
+        lines.extend(
+            "| " + " | ".join(cell(row.get(col)) for col in self.columns) + " |"
+            for row in self.data
+        )
+        return "\n".join(lines)
+
+
+# Rows per Arrow batch when streaming results
+STREAM_BATCH_SIZE = 1024
+
+
+# Shared connection: the CSV is loaded into 'events' once, not per query
+_conn: Optional[duckdb.DuckDBPyConnection] = None
+_conn_source: Optional[Tuple[str, float]] = None
+_conn_lock = threading.Lock()
+
+# Isolated connection for check_query: an empty copy of the events schema,
+# no file access, never the shared data connection
+_check_conn: Optional[duckdb.DuckDBPyConnection] = None
+_check_conn_source: Optional[Tuple[str, float]] = None
+_check_conn_lock = threading.Lock()
+
+
+def _data_source() -> Tuple[str, float]:
+    """Absolute data path and its modification time (reload key)."""
+    data_path = settings.get_absolute_path(settings.data_path)
+    try:
+        mtime = os.path.getmtime(data_path)
+    except OSError:
+        mtime = 0.0
+    return str(data_path), mtime
+
+
+def get_data_signature() -> str:
+    """
+    Identify the current data file version (path + modification time).
+    
+    Use as part of a cache key for anything derived from the data.
+    """
+    path, mtime = _data_source()
+    return f"{path}:{mtime}"
+
+
+def _ensure_parquet(csv_path: str) -> Optional[str]:
+    """
+    Convert the CSV to a Parquet file next to it (once, or when the CSV is newer).
+    
+    Returns:
+        Parquet path, or None if it could not be written (e.g. read-only
+        data directory); callers then fall back to the CSV
+    """
+    parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
+    tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+    
+    try:
+        if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+            return parquet_path
+        
+        # Write to a temp file and rename so readers never see a partial file
+        duckdb.execute(f"""
+            COPY (SELECT * FROM read_csv_auto('{csv_path}'))
+            TO '{tmp_path}' (FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE 100000)
+        """)
+        os.replace(tmp_path, parquet_path)
+        return parquet_path
+    except (duckdb.Error, OSError):
+        # Don't leave a partial temp file behind in the data directory
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        return None
 
 
 def get_connection() -> duckdb.DuckDBPyConnection:
-    """Get a DuckDB connection with the data table registered."""
-    conn = duckdb.connect(":memory:")
+    """
+    Get a cursor on the shared DuckDB connection with the data table registered.
     
-    # Register the CSV as a table called 'events'
-    data_path = settings.get_absolute_path(settings.data_path)
-    conn.execute(f"""
-        CREATE TABLE events AS 
-        SELECT * FROM read_csv_auto('{data_path}')
-    """)
+    The data is registered once per process and re-registered only when
+    the data path or file modification time changes. Each call returns its own
+    cursor (use it from one thread); closing it leaves the shared
+    connection open.
+    """
+    global _conn, _conn_source
     
-    return conn
+    source = _data_source()
+    with _conn_lock:
+        if _conn is None or _conn_source != source:
+            conn = duckdb.connect(":memory:")
+            
+            # Expose the data as 'events': a view over columnar Parquet (so
+            # queries read only the columns/row groups they need), or the
+            # CSV loaded into a table if Parquet is unavailable
+            parquet_path = _ensure_parquet(source[0])
+            if parquet_path:
+                conn.execute(f"CREATE VIEW events AS SELECT * FROM read_parquet('{parquet_path}')")
+            else:
+                conn.execute(f"""
+                    CREATE TABLE events AS 
+                    SELECT * FROM read_csv_auto('{source[0]}')
+                """)
+            
+            # Cursors on a replaced connection keep it alive until closed
+            _conn, _conn_source = conn, source
+        
+        return _conn.cursor()
+
+
+def _apply_table_alias(sql: str) -> str:
+    """Allow queries to reference 'sample_events' (or the CSV path) as 'events'."""
+    sql = sql.replace("'data/sample_events.csv'", "events")
+    return sql.replace("sample_events", "events")
+
+
+def _get_check_connection() -> duckdb.DuckDBPyConnection:
+    """
+    Get a cursor on the isolated, schema-only connection used by check_query.
+    
+    'events' is an empty table with the real column names/types, and
+    external access (files, COPY, read_csv) is disabled, so even a plan
+    that slipped through cannot read, write, or damage the shared data.
+    """
+    global _check_conn, _check_conn_source
+    
+    source = _data_source()
+    with _check_conn_lock:
+        if _check_conn is None or _check_conn_source != source:
+            shared = get_connection()
+            try:
+                columns = shared.execute("SELECT name, type FROM pragma_table_info('events')").fetchall()
+            finally:
+                shared.close()
+            
+            conn = duckdb.connect(":memory:", config={"enable_external_access": False})
+            column_defs = ", ".join(f'"{name}" {col_type}' for name, col_type in columns)
+            conn.execute(f"CREATE TABLE events ({column_defs})")
+            _check_conn, _check_conn_source = conn, source
+        
+        return _check_conn.cursor()
+
+
+def single_select_error(sql: str, conn: Optional[duckdb.DuckDBPyConnection] = None) -> Optional[str]:
+    """
+    Check that SQL is exactly one SELECT statement.
+    
+    DuckDB runs every statement in a multi-statement string, so anything
+    after the first ';' (DROP, COPY ... TO, ...) would execute too.
+    
+    Args:
+        sql: SQL query string
+        conn: Connection used for parsing (defaults to an in-memory one)
+        
+    Returns:
+        Error message, or None if the SQL is a single SELECT
+    """
+    try:
+        statements = (conn or duckdb.connect(":memory:")).extract_statements(sql)
+    except Exception as e:
+        return str(e)
+    
+    if len(statements) != 1:
+        return f"Expected exactly one SQL statement, got {len(statements)}"
+    if statements[0].type != duckdb.StatementType.SELECT:
+        return f"Only SELECT statements are allowed, got {statements[0].type.name}"
+    return None
 
 
-def execute_query(sql: str, use_table_alias: bool = True) -> QueryResult:
+def check_query(sql: str, use_table_alias: bool = True) -> Optional[str]:
+    """
+    Parse and bind a query without running it.
+    
+    Catches syntax errors and unknown tables/columns cheaply (EXPLAIN plans
+    the query but does not scan any data). Only a single SELECT statement
+    is accepted, and it is planned on an isolated schema-only connection.
+    
+    Args:
+        sql: SQL query string
+        use_table_alias: If True, replace 'sample_events' with 'events' table
+        
+    Returns:
+        Error message, or None if the query plans successfully
+    """
+    if use_table_alias:
+        sql = _apply_table_alias(sql)
+    
+    conn = _get_check_connection()
+    try:
+        error = single_select_error(sql, conn)
+        if error:
+            return error
+        conn.execute(f"EXPLAIN {sql}")
+    except Exception as e:
+        return str(e)
+    finally:
+        conn.close()
+    
+    return None
+
+
+def execute_query(
+    sql: str,
+    use_table_alias: bool = True,
+    params: Optional[Sequence[Any]] = None
+) -> QueryResult:
     """
     Execute a SQL query using DuckDB.
     
     Args:
         sql: SQL query string
         use_table_alias: If True, replace 'sample_events' with 'events' table
+        params: Values bound to ? placeholders (keeps SQL text constant
+            across calls instead of interpolating literals)
         
     Returns:
         QueryResult with data, columns, and metadata
@@ -68,10 +270,9 @@ def execute_query(sql: str, use_table_alias: bool = True) -> QueryResult:
         
         # Allow queries to reference 'sample_events' as well
         if use_table_alias:
-            sql = sql.replace("'data/sample_events.csv'", "events")
-            sql = sql.replace("sample_events", "events")
+            sql = _apply_table_alias(sql)
         
-        result = conn.execute(sql)
+        result = conn.execute(sql, params)
         
         # Get column names
         columns = [desc[0] for desc in result.description]
@@ -100,7 +301,110 @@ def execute_query(sql: str, use_table_alias: bool = True) -> QueryResult:
         )
 
 
-def execute_query_df(sql: str) -> pd.DataFrame:
+def execute_query_scalar(
+    sql: str,
+    use_table_alias: bool = True,
+    params: Optional[Sequence[Any]] = None
+) -> Optional[Tuple[Any, ...]]:
+    """
+    Execute a SQL query and return its first row as a native tuple.
+    
+    For single-row lookups (aggregates, stats): skips building column
+    names and per-row dicts.
+    
+    Args:
+        sql: SQL query string
+        use_table_alias: If True, replace 'sample_events' with 'events' table
+        params: Values bound to ? placeholders
+        
+    Returns:
+        First row as a tuple, or None if the query returned no rows
+        
+    Raises:
+        RuntimeError: If the query fails
+    """
+    if use_table_alias:
+        sql = _apply_table_alias(sql)
+    
+    conn = get_connection()
+    try:
+        return conn.execute(sql, params).fetchone()
+    except Exception as e:
+        raise RuntimeError(f"Query failed: {e}") from e
+    finally:
+        conn.close()
+
+
+def execute_query_arrow(sql: str, use_table_alias: bool = True) -> "pa.Table":
+    """
+    Execute a SQL query and return the result as an Arrow table.
+    
+    Values stay in DuckDB's columnar buffers instead of being boxed into
+    per-cell Python objects; convert with to_pandas()/to_pylist() as needed.
+    
+    Args:
+        sql: SQL query string
+        use_table_alias: If True, replace 'sample_events' with 'events' table
+        
+    Returns:
+        pyarrow Table with results
+        
+    Raises:
+        RuntimeError: If the query fails
+    """
+    if use_table_alias:
+        sql = _apply_table_alias(sql)
+    
+    conn = get_connection()
+    try:
+        return conn.execute(sql).to_arrow_table()
+    except Exception as e:
+        raise RuntimeError(f"Query failed: {e}") from e
+    finally:
+        conn.close()
+
+
+def execute_query_stream(
+    sql: str,
+    batch_size: int = STREAM_BATCH_SIZE,
+    use_table_alias: bool = True
+) -> Iterator[Dict[str, Any]]:
+    """
+    Execute a SQL query and yield result rows one Arrow batch at a time.
+    
+    Peak memory is bounded by one batch and the first rows arrive before
+    the query finishes. Streaming gives up some of DuckDB's intra-query
+    parallelism, so use it for large or paginated results only; small
+    queries are faster through execute_query().
+    
+    Args:
+        sql: SQL query string
+        batch_size: Rows fetched per batch
+        use_table_alias: If True, replace 'sample_events' with 'events' table
+        
+    Yields:
+        One dict per result row
+        
+    Raises:
+        RuntimeError: If the query fails
+    """
+    if use_table_alias:
+        sql = _apply_table_alias(sql)
+    
+    conn = get_connection()
+    try:
+        try:
+            reader = conn.execute(sql).to_arrow_reader(batch_size)
+        except Exception as e:
+            raise RuntimeError(f"Query failed: {e}") from e
+        
+        for batch in reader:
+            yield from batch.to_pylist()
+    finally:
+        conn.close()
+
+
+def execute_query_df(sql: str) -> "pd.DataFrame":
     """
     Execute a SQL query and return as pandas DataFrame.
     
@@ -110,25 +414,19 @@ def execute_query_df(sql: str) -> pd.DataFrame:
     Returns:
         pandas DataFrame with results
     """
-    result = execute_query(sql)
-    if not result.success:
-        raise RuntimeError(f"Query failed: {result.error}")
-    return result.to_df()
+    return execute_query_arrow(sql).to_pandas()
 
 
 def get_table_info() -> Dict[str, Any]:
     """Get information about the events table."""
     conn = get_connection()
     
-    # Get column info
-    columns = conn.execute("DESCRIBE events").fetchall()
-    
-    # Get row count
-    row_count = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+    # Get column info (catalog lookup, no scan)
+    columns = conn.execute("SELECT name, type FROM pragma_table_info('events')").fetchall()
     
-    # Get date range
-    date_range = conn.execute("""
-        SELECT MIN(event_date) as min_date, MAX(event_date) as max_date 
+    # Get row count and date range in one pass over a single column
+    row_count, min_date, max_date = conn.execute("""
+        SELECT COUNT(*) as row_count, MIN(event_date) as min_date, MAX(event_date) as max_date 
         FROM events
     """).fetchone()
     
@@ -139,8 +437,8 @@ def get_table_info() -> Dict[str, Any]:
         "columns": [{"name": c[0], "type": c[1]} for c in columns],
         "row_count": row_count,
         "date_range": {
-            "min": str(date_range[0]),
-            "max": str(date_range[1])
+            "min": str(min_date),
+            "max": str(max_date)
         }
     }
 
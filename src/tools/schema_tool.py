@@ -5,7 +5,7 @@ Provides context for agents to understand available columns and business metrics
 """
 
 import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, FrozenSet, List, Optional, Any
 from pathlib import Path
 from functools import lru_cache
 
@@ -48,8 +48,19 @@ def load_knowledge() -> Dict[str, Any]:
 
 def get_column_names() -> List[str]:
     """Get list of all column names."""
-    schema = load_schema()
-    return [col["name"] for col in schema["columns"]]
+    return list(_columns_by_name())
+
+
+@lru_cache(maxsize=1)
+def get_column_set() -> FrozenSet[str]:
+    """Get all column names as a frozenset (for membership checks)."""
+    return frozenset(_columns_by_name())
+
+
+@lru_cache(maxsize=1)
+def _columns_by_name() -> Dict[str, Dict]:
+    """Index schema columns by name (in schema order)."""
+    return {col["name"]: col for col in load_schema()["columns"]}
 
 
 def get_column_info(column_name: str) -> Optional[Dict]:
@@ -62,21 +73,21 @@ def get_column_info(column_name: str) -> Optional[Dict]:
     Returns:
         Dict with name, type, description, and enum values if applicable
     """
-    schema = load_schema()
+    col = _columns_by_name().get(column_name)
+    if col is None:
+        return None
     
-    for col in schema["columns"]:
-        if col["name"] == column_name:
-            result = col.copy()
-            
-            # Add enum values if this column has them
-            if "enum" in col:
-                result["enum_values"] = col["enum"]
-            elif column_name in schema.get("enums", {}):
-                result["enum_details"] = schema["enums"][column_name]
-            
-            return result
+    result = col.copy()
     
-    return None
+    # Add enum values if this column has them
+    if "enum" in col:
+        result["enum_values"] = col["enum"]
+    else:
+        enums = load_schema().get("enums", {})
+        if column_name in enums:
+            result["enum_details"] = enums[column_name]
+    
+    return result
 
 
 def get_enum_values(enum_name: str) -> Optional[Dict]:
@@ -146,6 +157,7 @@ def get_glossary() -> Dict[str, Dict[str, str]]:
     return knowledge.get("glossary", {})
 
 
+@lru_cache(maxsize=1)
 def get_schema_context() -> str:
     """
     Get formatted schema context for LLM prompts.
@@ -180,6 +192,7 @@ def get_schema_context() -> str:
     return "\n".join(lines)
 
 
+@lru_cache(maxsize=1)
 def get_metrics_context() -> str:
     """
     Get formatted metrics context for LLM prompts.
@@ -198,6 +211,19 @@ def get_metrics_context() -> str:
     return "\n".join(lines)
 
 
+def reload_schema() -> None:
+    """
+    Drop cached schema/knowledge and the prompt contexts built from them.
+    
+    Call after editing schema.json or knowledge.json (dev hot-reload).
+    """
+    for cached in (
+        load_schema, load_knowledge, _columns_by_name, get_column_set,
+        get_schema_context, get_metrics_context
+    ):
+        cached.cache_clear()
+
+
 if __name__ == "__main__":
     print("=== Schema Context ===")
     print(get_schema_context())
@@ -0,0 +1,80 @@
+"""
+Shared pytest fixtures.
+"""
+
+import copy
+import functools
+import hashlib
+import json
+import types
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--cached",
+        action="store_true",
+        default=False,
+        help="Reuse SQL generated by earlier runs (stored in .pytest_cache) instead of calling the LLM"
+    )
+
+
+@pytest.fixture(scope="session")
+def cached_classify():
+    """classify_intent memoized for the session (identical questions classify once)."""
+    from src.orchestrator.router import classify_intent
+    return functools.lru_cache(maxsize=128)(classify_intent)
+
+
+@pytest.fixture(scope="session")
+def sql_agent_run():
+    """The SQL agent's run() (imported once per session)."""
+    from src.specialists.sql_agent.agent import run
+    return run
+
+
+# Read-only template: writing to it raises instead of leaking into other tests
+_BASE_SQL_STATE = types.MappingProxyType({
+    "user_question": "What is the total deposit amount?",
+    "definition_result": {
+        "metric": {"function": "SUM", "column": "event_amount"},
+        "dimensions": [],
+        "filters": []
+    }
+})
+
+
+@pytest.fixture
+def base_sql_state():
+    """SQL agent state with a simple SUM definition (a private copy per test)."""
+    return copy.deepcopy(dict(_BASE_SQL_STATE))
+
+
+@pytest.fixture
+def cached_sql_agent_run(request, sql_agent_run):
+    """
+    run() that, with --cached, reuses the sql_query from an earlier run.
+    
+    Cache entries are keyed by a hash of the input state. On a hit only
+    {"sql_query": ...} is returned; without --cached every call runs live.
+    """
+    use_cache = request.config.getoption("--cached")
+    
+    def run(state):
+        if not use_cache:
+            return sql_agent_run(state)
+        
+        key = "sql_agent/" + hashlib.sha256(
+            json.dumps(state, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        sql_query = request.config.cache.get(key, None)
+        if sql_query is not None:
+            return {"sql_query": sql_query}
+        
+        result = sql_agent_run(state)
+        if result.get("sql_query"):
+            request.config.cache.set(key, result["sql_query"])
+        return result
+    
+    return run
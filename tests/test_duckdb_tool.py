@@ -2,8 +2,11 @@
 Tests for the DuckDB tool.
 """
 
+from unittest.mock import patch
+
 import pytest
-from src.tools.duckdb_tool import execute_query, execute_query_df
+from src.tools import duckdb_tool
+from src.tools.duckdb_tool import execute_query, execute_query_df, execute_query_stream, check_query
 
 
 class TestDuckDBTool:
@@ -47,6 +50,55 @@ class TestDuckDBTool:
         assert df.shape[0] == 5
 
 
+class TestExecuteQueryStream:
+    """Test batched row streaming."""
+    
+    def test_stream_yields_all_rows(self):
+        """Streaming across several batches yields the same rows as execute_query."""
+        sql = "SELECT event_id, channel FROM events ORDER BY event_id LIMIT 25"
+        
+        rows = list(execute_query_stream(sql, batch_size=10))
+        
+        assert rows == execute_query(sql).data
+        assert len(rows) == 25
+    
+    def test_stream_invalid_sql_raises(self):
+        """Invalid SQL should raise when the generator is consumed."""
+        with pytest.raises(RuntimeError):
+            list(execute_query_stream("SELECT * FROM nonexistent_table"))
+
+
+class TestEnsureParquet:
+    """Test the cached Parquet copy of the CSV."""
+    
+    def test_failed_write_leaves_no_temp_file(self, tmp_path):
+        """A failed conversion returns None and cleans up its temp file."""
+        csv_path = tmp_path / "events.csv"
+        csv_path.write_text("a,b\n1,2\n")
+        
+        with patch("src.tools.duckdb_tool.os.replace", side_effect=OSError("read-only")):
+            assert duckdb_tool._ensure_parquet(str(csv_path)) is None
+        
+        assert list(tmp_path.iterdir()) == [csv_path]
+
+
+class TestCheckQuery:
+    """check_query must never run anything but a single SELECT."""
+    
+    def test_stacked_drop_rejected(self):
+        """A '; DROP VIEW events' payload is rejected and the data stays queryable."""
+        error = check_query("SELECT 1; DROP VIEW events")
+        
+        assert error is not None
+        result = execute_query("SELECT COUNT(*) AS n FROM events")
+        assert result.success
+        assert result.data[0]["n"] > 0
+    
+    def test_non_select_rejected(self):
+        """Non-SELECT statements are rejected before planning."""
+        assert check_query("COPY (SELECT 1) TO '/tmp/check_query_copy.csv'") is not None
+
+
 class TestQueryResults:
     """Test specific query results."""
     
@@ -0,0 +1,88 @@
+"""
+Tests for the explanation agent.
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+explanation_mod = pytest.importorskip("src.specialists.explanation_agent.agent")
+LLMResponse = pytest.importorskip("src.config.llm").LLMResponse
+
+AGENT = "src.specialists.explanation_agent.agent"
+
+
+def _state(n):
+    return {
+        "user_question": f"Question {n}",
+        "sql_query": f"SELECT {n} AS value",
+        "sql_result": {"data": [{"value": n}], "columns": ["value"], "row_count": 1},
+        "quality_result": {},
+    }
+
+
+@pytest.mark.xdist_group("explanation_agent")
+class TestExplanationBatch:
+    """Test batched explanation calls."""
+    
+    def test_truncated_batch_falls_back_per_state(self):
+        """A truncated batch response is retried as one call per state."""
+        explanation_mod.clear_explanation_cache()
+        states = [_state(n) for n in range(3)]
+        single = {
+            "summary": "ok", "insights": [], "caveats": [],
+            "assumptions": [], "follow_up_questions": []
+        }
+        responses = [LLMResponse(content='{"explanations": [{"summary": "cut', model="test", usage={})]
+        responses += [LLMResponse(content=json.dumps(single), model="test", usage={})] * len(states)
+        
+        with patch(f"{AGENT}.get_llm_client") as mock_client, \
+             patch(f"{AGENT}._semantic_cache.lookup", return_value=None), \
+             patch(f"{AGENT}._semantic_cache.store"):
+            complete = mock_client.return_value.complete
+            complete.side_effect = responses
+            results = explanation_mod.run_batch(states)
+        
+        assert complete.call_count == 1 + len(states)
+        batch_call = complete.call_args_list[0]
+        assert batch_call.kwargs["max_tokens"] == explanation_mod.BATCH_TOKENS_PER_QUERY * len(states)
+        assert [r["explanation"]["summary"] for r in results] == ["ok"] * len(states)
+
+
+@pytest.mark.xdist_group("explanation_agent")
+class TestExplanationStream:
+    """Test streamed explanations."""
+    
+    def test_error_after_answer_keeps_single_header(self):
+        """An error mid-stream does not repeat the already streamed Answer header."""
+        explanation_mod.clear_explanation_cache()
+        
+        async def failing_stream(**kwargs):
+            yield '{"summary": "Revenue grew", "insights": ["'
+            raise RuntimeError("connection reset")
+        
+        async def collect():
+            return [f async for f in explanation_mod.stream(_state(1))]
+        
+        with patch(f"{AGENT}.get_llm_client") as mock_client, \
+             patch(f"{AGENT}._semantic_cache.lookup", return_value=None):
+            mock_client.return_value.astream = failing_stream
+            text = "".join(asyncio.run(collect()))
+        
+        assert text.count(explanation_mod.ANSWER_HEADER) == 1
+        assert "connection reset" in text
+
+
+class TestFormatTable:
+    """Test the markdown result table."""
+    
+    def test_rows_without_columns(self):
+        """Rows with no columns render as an empty table instead of raising."""
+        assert explanation_mod._format_table([{}, {}]) == ""
+        assert explanation_mod._format_table([]) == ""
+    
+    def test_single_column(self):
+        """A single column renders one value per row."""
+        assert explanation_mod._format_table([{"n": 1}, {"n": 2}]) == "| n |\n| --- |\n| 1 |\n| 2 |"
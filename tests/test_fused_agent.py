@@ -0,0 +1,35 @@
+"""
+Tests for the fused SQL + explanation agent.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+fused_mod = pytest.importorskip("src.specialists.fused_agent")
+LLMResponse = pytest.importorskip("src.config.llm").LLMResponse
+
+AGENT = "src.specialists.fused_agent"
+
+
+@pytest.mark.xdist_group("sql_agent")
+class TestFusedFallback:
+    """Test the fallback to the separate agents."""
+    
+    def test_fallback_reuses_context_and_counts_tokens(self, base_sql_state):
+        """The fallback does not gather context again and keeps the fused call's usage."""
+        context = ("rag", {}, {}, "discovery")
+        response = LLMResponse(content="not json", model="test", usage={"total_tokens": 40})
+        with patch(f"{AGENT}.sql_agent.gather_context", return_value=context) as mock_gather, \
+             patch(f"{AGENT}.get_llm_client") as mock_client, \
+             patch(f"{AGENT}.sql_agent.run_with_context") as mock_sql, \
+             patch(f"{AGENT}.data_quality_agent.run", return_value={}), \
+             patch(f"{AGENT}.explanation_agent.run", return_value={}):
+            mock_client.return_value.complete.return_value = response
+            mock_sql.return_value = {"sql_result": {"data": []}, "_sql_tokens": {"total_tokens": 60}}
+            result = fused_mod.run(base_sql_state)
+        
+        mock_gather.assert_called_once()
+        assert mock_sql.call_args.args[1:] == context
+        assert result["_sql_tokens"] == {"total_tokens": 100}
+        assert result["fused"] is False
@@ -0,0 +1,31 @@
+"""
+Tests for the persistent LLM cache.
+"""
+
+import time
+
+import pytest
+
+llm_cache = pytest.importorskip("src.config.llm_cache")
+
+
+class TestLLMCache:
+    """Test LLM cache storage and expiry."""
+    
+    def test_round_trip(self, tmp_path):
+        """A stored response is returned with its original usage."""
+        conn = llm_cache.get_connection(tmp_path / "cache.sqlite")
+        llm_cache.put(conn, "k", "value", {"total_tokens": 7})
+        
+        assert llm_cache.get(conn, "k") == ("value", {"total_tokens": 7})
+    
+    def test_expired_entry_is_miss(self, tmp_path):
+        """Entries older than the TTL are treated as misses."""
+        conn = llm_cache.get_connection(tmp_path / "cache.sqlite")
+        llm_cache.put(conn, "k", "value", {})
+        with conn:
+            conn.execute("UPDATE llm_cache SET created = ?", (time.time() - 120,))
+        
+        assert llm_cache.get(conn, "k", ttl=60) is None
+        assert llm_cache.get(conn, "k", ttl=600) is not None
+        assert llm_cache.get(conn, "k") is not None
@@ -3,30 +3,42 @@ Tests for the orchestrator routing logic.
 """
 
 import pytest
-from src.orchestrator.router import route_to_specialists, classify_intent
+from src.orchestrator.router import route_to_specialists
+from src.orchestrator.state import OrchestratorState
+
+
+# Keys declared on the state TypedDict (computed once at import)
+STATE_KEYS = frozenset(OrchestratorState.__annotations__)
+
+# Fields every orchestrator state must declare
+_EXPECTED_KEYS = frozenset({
+    "user_question",
+    "intent",
+    "selected_agents",
+    "sql_query",
+    "sql_result",
+    "final_response"
+})
+
+
+@pytest.fixture(scope="module")
+def routed_agents():
+    """Routing result for a data question (routing is deterministic)."""
+    return route_to_specialists({"user_question": "What is the total deposit amount?"})
 
 
 class TestRouter:
     """Test routing logic."""
     
-    def test_route_returns_list(self):
-        """Router should return a list of agent names."""
-        state = {"user_question": "What is the total deposit amount?"}
-        agents = route_to_specialists(state)
-        
-        assert isinstance(agents, list)
-        assert len(agents) > 0
-    
-    def test_route_includes_sql_agent(self):
-        """SQL agent should be included for data queries."""
-        state = {"user_question": "What is the total deposit amount?"}
-        agents = route_to_specialists(state)
-        
-        assert "sql_agent" in agents
+    def test_route(self, routed_agents):
+        """Router should return a non-empty list of agents including the SQL agent."""
+        assert isinstance(routed_agents, list)
+        assert len(routed_agents) > 0
+        assert "sql_agent" in routed_agents
     
-    def test_classify_intent_returns_string(self):
+    def test_classify_intent_returns_string(self, cached_classify):
         """Intent classifier should return a string."""
-        intent = classify_intent("What is the total deposit amount?")
+        intent = cached_classify("What is the total deposit amount?")
         
         assert isinstance(intent, str)
         assert len(intent) > 0
@@ -37,17 +49,5 @@ class TestOrchestratorState:
     
     def test_state_has_required_fields(self):
         """State should have all required fields."""
-        from src.orchestrator.state import OrchestratorState
-        
         # Check TypedDict has expected keys
-        expected_keys = [
-            "user_question",
-            "intent",
-            "selected_agents",
-            "sql_query",
-            "sql_result",
-            "final_response"
-        ]
-        
-        for key in expected_keys:
-            assert key in OrchestratorState.__annotations__
+        assert _EXPECTED_KEYS.issubset(STATE_KEYS), f"missing: {sorted(_EXPECTED_KEYS - STATE_KEYS)}"